@@ -2,12 +2,18 @@ import customtkinter as ctk
 import tkinter as tk
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from .plot_logic import PlotLogicMixin
+from .plot_logic import PlotLogicMixin, COORD_LABELS
+from .worker import IntersectionWorker
+from .history import DeltaHistory
+from .model import GeometryModel
 
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
 class ModernSegmentApp(ctk.CTk, PlotLogicMixin):
+    POLL_INTERVAL_MS = 20 # Jak często GUI odbiera wyniki z wątku roboczego
+    HISTORY_BUDGET = 400  # Limit historii: liczba zapisanych współrzędnych
+
     def __init__(self):
         super().__init__()
         self.title("Intersection Solver - Professional")
@@ -21,10 +27,12 @@ class ModernSegmentApp(ctk.CTk, PlotLogicMixin):
         self.pan_start_x = 0
         self.pan_start_y = 0
         self.shift_pressed = False 
-        self.history = [] 
-        self.history_index = -1 
+        self.history = DeltaHistory(budget=self.HISTORY_BUDGET)
         self.is_history_restoring = False 
         self.entries = {}
+        self.model = GeometryModel(COORD_LABELS)
+        self.worker = IntersectionWorker()
+        self.current_job = None
 
         # --- GUI Setup ---
         self.sidebar_frame = ctk.CTkFrame(self, width=300, corner_radius=0)
@@ -48,6 +56,7 @@ class ModernSegmentApp(ctk.CTk, PlotLogicMixin):
         self.update_graph()
         self.reset_view()
         self.save_history_snapshot(force=True)
+        self.after(self.POLL_INTERVAL_MS, self.poll_results)
 
         self.bind("<KeyPress-Shift_L>", self.on_shift_press)
         self.bind("<KeyPress-Shift_R>", self.on_shift_press)
@@ -77,9 +86,10 @@ class ModernSegmentApp(ctk.CTk, PlotLogicMixin):
             e = ctk.CTkEntry(box, width=60)
             e.insert(0, str(val))
             e.pack(side="left", padx=5, expand=True, fill="x")
-            e.bind("<KeyRelease>", self.update_graph)
+            e.bind("<KeyRelease>", lambda event, key=key: self.on_entry_edit(key))
             e.bind("<FocusOut>", lambda e: self.save_history_snapshot())
             self.entries[key] = e
+            self.model.set(key, val)
 
     def create_controls(self):
         self.controls_frame = ctk.CTkFrame(self.sidebar_frame, fg_color="transparent")
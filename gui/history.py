@@ -0,0 +1,69 @@
+from collections import deque
+
+class DeltaHistory:
+    """
+    Historia zmian (Cofnij/Ponów) przechowywana jako różnice, a nie pełne stany.
+
+    Każdy wpis to krotka zmian (indeks, stara_wartość, nowa_wartość) - zapisujemy
+    tylko przesunięte współrzędne. Zamiast stałej liczby kroków obowiązuje budżet
+    pamięci liczony w zapisanych współrzędnych; po jego przekroczeniu najstarsze
+    wpisy są usuwane z początku kolejki (deque.popleft, O(1)).
+    """
+    def __init__(self, budget=400):
+        self.budget = budget
+        self.undo_stack = deque()
+        self.redo_stack = deque()
+        self.cost = 0         # Liczba współrzędnych zapisanych w obu stosach
+        self.baseline = None  # Ostatni zatwierdzony stan (punkt odniesienia dla różnic)
+
+    def reset(self, coords):
+        """Ustawia stan początkowy i czyści historię."""
+        self.baseline = list(coords)
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.cost = 0
+
+    def record(self, coords):
+        """
+        Zapisuje różnicę między stanem bazowym a `coords`.
+        Zwraca False, jeśli nic się nie zmieniło.
+        """
+        if self.baseline is None or len(coords) != len(self.baseline):
+            self.reset(coords)
+            return True
+
+        changes = tuple((i, old, new) for i, (old, new) in enumerate(zip(self.baseline, coords)) if old != new)
+        if not changes: return False
+
+        for i, _, new in changes:
+            self.baseline[i] = new
+
+        # Nowa zmiana unieważnia gałąź "Ponów"
+        self.cost -= sum(len(entry) for entry in self.redo_stack)
+        self.redo_stack.clear()
+
+        self.undo_stack.append(changes)
+        self.cost += len(changes)
+        while self.cost > self.budget and len(self.undo_stack) > 1:
+            self.cost -= len(self.undo_stack.popleft())
+        return True
+
+    def undo(self):
+        """Cofa ostatni wpis. Zwraca listę (indeks, wartość) do przywrócenia."""
+        if not self.undo_stack: return []
+        changes = self.undo_stack.pop()
+        self.redo_stack.append(changes)
+        restored = [(i, old) for i, old, _ in changes]
+        for i, value in restored:
+            self.baseline[i] = value
+        return restored
+
+    def redo(self):
+        """Ponawia ostatnio cofnięty wpis. Zwraca listę (indeks, wartość) do ustawienia."""
+        if not self.redo_stack: return []
+        changes = self.redo_stack.pop()
+        self.undo_stack.append(changes)
+        restored = [(i, new) for i, _, new in changes]
+        for i, value in restored:
+            self.baseline[i] = value
+        return restored
@@ -0,0 +1,38 @@
+from array import array
+
+class GeometryModel:
+    """
+    Model współrzędnych - jedyne źródło prawdy o geometrii.
+
+    Wartości przechowujemy w tablicy liczb zmiennoprzecinkowych (array('d')).
+    Pola tekstowe zapisują do modelu dopiero po poprawnym sparsowaniu wpisu,
+    a obsługa zdarzeń (rysowanie, mysz, historia) czyta tablicę bezpośrednio,
+    bez ponownego parsowania tekstu przy każdym zdarzeniu.
+    """
+    def __init__(self, labels, values=None):
+        self.labels = list(labels)
+        self.index = {lbl: i for i, lbl in enumerate(self.labels)}
+        self.values = array('d', values if values is not None else [0.0] * len(self.labels))
+        self.invalid = set() # Pola, których tekst nie jest poprawną liczbą
+
+    def set(self, label, value):
+        self.values[self.index[label]] = value
+        self.invalid.discard(label)
+
+    def set_text(self, label, text):
+        """Parsuje wpis użytkownika (akceptuje przecinek). Zwraca False przy błędzie."""
+        try:
+            value = float(text.replace(',', '.'))
+        except ValueError:
+            self.invalid.add(label)
+            return False
+        self.set(label, value)
+        return True
+
+    def get(self, label):
+        return self.values[self.index[label]]
+
+    def coords(self):
+        """Zwraca tablicę współrzędnych lub None, jeśli któreś pole jest błędne."""
+        if self.invalid: return None
+        return self.values
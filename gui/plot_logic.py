@@ -1,27 +1,30 @@
 import math
+import queue
 import tkinter as tk
 from tkinter import filedialog
-from logic.algorithm import find_intersection
 from logic.math_utils import get_line_equation, distance_point_to_segment
 
+COORD_LABELS = ['x1', 'y1', 'x2', 'y2', 'x3', 'y3', 'x4', 'y4']
+
 class PlotLogicMixin:
     """Logika wykresu, obsługa myszki, historia i funkcje pomocnicze."""
 
     # --- HELPERS ---
     def get_coords(self):
-        try:
-            vals = []
-            for lbl in ['x1', 'y1', 'x2', 'y2', 'x3', 'y3', 'x4', 'y4']:
-                val = self.entries[lbl].get().replace(',', '.')
-                vals.append(float(val))
-            return vals
-        except ValueError:
-            return None
+        return self.model.coords()
 
     def set_coord(self, label, value):
+        # Model przechowuje dokładnie to, co widać w polu (2 miejsca po przecinku)
+        value = round(value, 2)
+        self.model.set(label, value)
         self.entries[label].delete(0, tk.END)
         self.entries[label].insert(0, f"{value:.2f}")
 
+    def on_entry_edit(self, label):
+        """Zapisuje poprawny wpis z pola tekstowego do modelu i odświeża wykres."""
+        self.model.set_text(label, self.entries[label].get())
+        self.update_graph()
+
     def get_safe_limits(self, values, min_span=4.0):
         if not values: return 0, 10
         min_v, max_v = min(values), max(values)
@@ -63,39 +66,25 @@ class PlotLogicMixin:
         if self.is_history_restoring: return
         current_coords = self.get_coords()
         if current_coords is None: return
-        if not force and self.history:
-            if self.history[self.history_index] == current_coords: return 
-        if self.history_index < len(self.history) - 1:
-            self.history = self.history[:self.history_index + 1]
-        self.history.append(current_coords)
-        self.history_index += 1
-        if len(self.history) > 50:
-            self.history.pop(0)
-            self.history_index -= 1
+        if force:
+            self.history.reset(current_coords)
+        else:
+            self.history.record(current_coords)
 
     def undo_action(self):
-        if self.history_index > 0:
-            self.is_history_restoring = True
-            self.history_index -= 1
-            prev_coords = self.history[self.history_index]
-            self.apply_coords(prev_coords)
-            self.update_graph()
-            self.is_history_restoring = False
+        self.apply_changes(self.history.undo())
 
     def redo_action(self):
-        if self.history_index < len(self.history) - 1:
-            self.is_history_restoring = True
-            self.history_index += 1
-            next_coords = self.history[self.history_index]
-            self.apply_coords(next_coords)
-            self.update_graph()
-            self.is_history_restoring = False
+        self.apply_changes(self.history.redo())
 
-    def apply_coords(self, coords):
-        labels = ['x1', 'y1', 'x2', 'y2', 'x3', 'y3', 'x4', 'y4']
-        for i, lbl in enumerate(labels):
-            self.entries[lbl].delete(0, tk.END)
-            self.entries[lbl].insert(0, f"{coords[i]:.2f}")
+    def apply_changes(self, changes):
+        """Przywraca tylko zmienione współrzędne (lista par (indeks, wartość))."""
+        if not changes: return
+        self.is_history_restoring = True
+        for i, value in changes:
+            self.set_coord(COORD_LABELS[i], value)
+        self.update_graph()
+        self.is_history_restoring = False
 
     # --- EVENTS (MOUSE & KEYBOARD) ---
     def on_shift_press(self, event): self.shift_pressed = True
@@ -257,6 +246,7 @@ class PlotLogicMixin:
         self.ax.add_artist(self.tooltip)
 
         if coords is None:
+            self.current_job = None
             self.lbl_status_main.configure(text="BŁĄD DANYCH")
             self.status_card.configure(fg_color="#C0392B")
             self.canvas.draw()
@@ -265,7 +255,55 @@ class PlotLogicMixin:
         P1, P2 = (coords[0], coords[1]), (coords[2], coords[3])
         P3, P4 = (coords[4], coords[5]), (coords[6], coords[7])
 
-        res_type, res_data = find_intersection(P1, P2, P3, P4, infinite=is_infinite)
+        # Obliczenia w wątku roboczym - wynik dorysuje poll_results
+        self.current_job = self.worker.submit(P1, P2, P3, P4, infinite=is_infinite)
+        # Do czasu nadejścia wyniku karta nie może pokazywać stanu poprzedniej geometrii
+        self.lbl_status_main.configure(text="OBLICZANIE...")
+        self.lbl_status_sub.configure(text="...")
+        self.status_card.configure(fg_color="#444444")
+
+        if is_infinite:
+            self.ax.axline(P1, P2, color='#00E5FF', linewidth=2, alpha=0.6, label='Prosta 1')
+            self.ax.plot([P1[0], P2[0]], [P1[1], P2[1]], color='#00E5FF', marker='o', linestyle='', markersize=8, picker=True)
+            self.ax.axline(P3, P4, color='#E040FB', linewidth=2, alpha=0.6, label='Prosta 2')
+            self.ax.plot([P3[0], P4[0]], [P3[1], P4[1]], color='#E040FB', marker='o', linestyle='', markersize=8, picker=True)
+        else:
+            self.ax.plot([P1[0], P2[0]], [P1[1], P2[1]], color='#00E5FF', marker='o', label='Odcinek 1', markersize=8, linewidth=2, alpha=0.8, picker=True)
+            self.ax.plot([P3[0], P4[0]], [P3[1], P4[1]], color='#E040FB', marker='o', label='Odcinek 2', markersize=8, linewidth=2, alpha=0.8, picker=True)
+
+        self.ax.legend(facecolor='#333333', edgecolor='#333333', labelcolor='white')
+        self.ax.set_xlim(current_xlim)
+        self.ax.set_ylim(current_ylim)
+        self.ax.set_aspect('equal', adjustable='box')
+        self.canvas.draw()
+
+    # --- WYNIKI Z WĄTKU ROBOCZEGO ---
+    def poll_results(self):
+        """Odbiera wyniki z kolejki wątku roboczego (wywoływane cyklicznie przez `after`)."""
+        changed = False
+        try:
+            while True:
+                kind, job_id, data = self.worker.results.get_nowait()
+                if job_id != self.current_job: continue # Wynik nieaktualnej geometrii
+                if kind == "PARTIAL":
+                    self.draw_partial_point(data)
+                else:
+                    self.show_result(*data)
+                changed = True
+        except queue.Empty:
+            pass
+        if changed:
+            self.canvas.draw_idle()
+        self.after(self.POLL_INTERVAL_MS, self.poll_results)
+
+    def draw_partial_point(self, pt):
+        current_xlim, current_ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        self.ax.plot(pt[0], pt[1], color='#FFFF00', marker='.', markersize=6, zorder=9)
+        self.ax.set_xlim(current_xlim)
+        self.ax.set_ylim(current_ylim)
+
+    def show_result(self, res_type, res_data):
+        current_xlim, current_ylim = self.ax.get_xlim(), self.ax.get_ylim()
 
         if res_type == "POINT":
             self.lbl_status_main.configure(text="PRZECIĘCIE")
@@ -280,15 +318,6 @@ class PlotLogicMixin:
             self.lbl_status_sub.configure(text="")
             self.status_card.configure(fg_color="#C0392B")
 
-        if is_infinite:
-            self.ax.axline(P1, P2, color='#00E5FF', linewidth=2, alpha=0.6, label='Prosta 1')
-            self.ax.plot([P1[0], P2[0]], [P1[1], P2[1]], color='#00E5FF', marker='o', linestyle='', markersize=8, picker=True)
-            self.ax.axline(P3, P4, color='#E040FB', linewidth=2, alpha=0.6, label='Prosta 2')
-            self.ax.plot([P3[0], P4[0]], [P3[1], P4[1]], color='#E040FB', marker='o', linestyle='', markersize=8, picker=True)
-        else:
-            self.ax.plot([P1[0], P2[0]], [P1[1], P2[1]], color='#00E5FF', marker='o', label='Odcinek 1', markersize=8, linewidth=2, alpha=0.8, picker=True)
-            self.ax.plot([P3[0], P4[0]], [P3[1], P4[1]], color='#E040FB', marker='o', label='Odcinek 2', markersize=8, linewidth=2, alpha=0.8, picker=True)
-
         if res_type == "POINT":
             self.ax.plot(res_data[0], res_data[1], color='#FFFF00', marker='*', markersize=15, zorder=10, label='Przecięcie', markeredgecolor='black')
         elif res_type == "SEGMENT":
@@ -298,5 +327,3 @@ class PlotLogicMixin:
         self.ax.legend(facecolor='#333333', edgecolor='#333333', labelcolor='white')
         self.ax.set_xlim(current_xlim)
         self.ax.set_ylim(current_ylim)
-        self.ax.set_aspect('equal', adjustable='box')
-        self.canvas.draw()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import queue
+import threading
+from logic.algorithm import find_intersection
+
+class _StaleJob(Exception):
+    """Przerywa obliczenia zlecenia, które zostało zastąpione nowszym."""
+
+class IntersectionWorker:
+    """
+    Wątek roboczy liczący przecięcia poza pętlą główną Tk.
+
+    Wyniki trafiają do kolejki `results` (bezpiecznej wątkowo), którą GUI
+    odczytuje cyklicznie przez `after`. Każde zlecenie dostaje numer -
+    zlecenie nowsze unieważnia starsze, a jego wynik końcowy jest odrzucany.
+
+    Trwające zamiatanie da się przerwać tylko w `on_point`, czyli przy
+    najbliższym znalezionym punkcie. Ciężkie zamiatanie bez przecięć nie ma
+    takiego miejsca i liczy się do końca (jego wynik i tak nie trafi do GUI).
+
+    Komunikaty w `results`: ("PARTIAL", job_id, punkt) oraz
+    ("DONE", job_id, (res_type, res_data)).
+    """
+    def __init__(self):
+        self.results = queue.Queue()
+        self._jobs = queue.Queue()
+        self._latest_job = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, P1, P2, P3, P4, infinite=False):
+        """Zleca obliczenia i zwraca numer zlecenia."""
+        self._latest_job += 1
+        job_id = self._latest_job
+        self._jobs.put((job_id, (P1, P2, P3, P4), infinite))
+        return job_id
+
+    def is_stale(self, job_id):
+        return job_id != self._latest_job
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            # Z zaległych zleceń liczy się tylko najnowsze
+            try:
+                while True:
+                    job = self._jobs.get_nowait()
+            except queue.Empty:
+                pass
+
+            job_id, points, infinite = job
+            if self.is_stale(job_id): continue
+
+            def on_point(pt, job_id=job_id):
+                if self.is_stale(job_id): raise _StaleJob()
+                self.results.put(("PARTIAL", job_id, pt))
+
+            try:
+                result = find_intersection(*points, infinite=infinite, on_point=on_point)
+            except _StaleJob:
+                continue
+            if self.is_stale(job_id): continue # Zastąpione w trakcie liczenia bez punktów
+            self.results.put(("DONE", job_id, result))
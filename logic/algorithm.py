@@ -1,7 +1,9 @@
 import heapq
 import bisect
+import math
 from .primitives import Point, Segment, Event
-from .math_utils import det, on_segment, get_intersection_math, y_at_x
+from .math_utils import line_key, line_keys_around
+from .kernels import get_kernel
 
 # --- STRUKTURA STATUSU (SWEEP LINE STATUS) ---
 
@@ -13,20 +15,25 @@ class SweepLineStatus:
     
     W podręcznikowej wersji jest to Zbalansowane Drzewo BST.
     W Pythonie symulujemy to listą posortowaną + bisect (dla prostoty implementacji).
+    Porównania przechodzą przez predykaty y_at_x i slope wybranego jądra (kernels).
     """
-    def __init__(self):
+    def __init__(self, kernel=None):
         self.active_segments = [] 
         self.current_x = 0 
+        self.kernel = kernel or get_kernel()
 
     def _key(self, seg):
-        """Klucz sortowania: Y odcinka w aktualnym X."""
-        return y_at_x(seg, self.current_x)
+        """
+        Klucz sortowania: Y odcinka w aktualnym X.
+        Przy równym Y (wspólny punkt) decyduje nachylenie - wyżej jest odcinek,
+        który na prawo od miotły wznosi się szybciej.
+        """
+        return (self.kernel.y_at_x(seg, self.current_x), self.kernel.slope(seg))
 
     def insert(self, segment, x):
         """Wstawia odcinek zachowując porządek Y."""
         self.current_x = x
-        keys = [self._key(s) for s in self.active_segments]
-        idx = bisect.bisect_right(keys, self._key(segment))
+        idx = bisect.bisect_right(self.active_segments, self._key(segment), key=self._key)
         self.active_segments.insert(idx, segment)
         return idx
 
@@ -39,27 +46,44 @@ class SweepLineStatus:
                 return i
         return -1
 
-    def swap_segments(self, s1, s2):
+    def reorder_at_point(self, segments, x, y):
         """
-        Zamienia miejscami dwa sąsiednie odcinki w strukturze statusu.
+        Odwraca kolejność odcinków przechodzących przez punkt przecięcia (x, y).
         Jest to kluczowe dla algorytmu Bentley-Ottmanna:
         Po przecięciu, odcinek który był "wyżej", teraz jest "niżej" (i vice versa).
+
+        Zamiast zamiany jednej pary porządkujemy cały ciągły blok odcinków
+        o Y równym y w punkcie x (np. trzy odcinki przez jeden punkt) według
+        nachylenia - tak, jak ułożą się tuż za punktem. Odcinki, które jedynie
+        stykają się końcami, zachowują swoją kolejność.
+        Zwraca zakres bloku (lo, hi) lub None, jeśli żaden odcinek nie jest w statusie.
         """
-        try:
-            i1 = self.active_segments.index(s1)
-            i2 = self.active_segments.index(s2)
-            # Zamiana w liście
-            self.active_segments[i1], self.active_segments[i2] = self.active_segments[i2], self.active_segments[i1]
-        except ValueError:
-            pass # Odcinki mogły zostać usunięte w międzyczasie
-
-    def get_neighbors_by_segment(self, segment):
-        """Znajduje sąsiadów dla podanego obiektu odcinka."""
-        try:
-            idx = self.active_segments.index(segment)
-            return self.get_neighbors_at_index(idx)
-        except ValueError:
-            return None, None
+        self.current_x = x
+        ids = {seg.id for seg in segments}
+        found = [i for i, s in enumerate(self.active_segments) if s.id in ids]
+        if not found: return None # Odcinki mogły zostać usunięte w międzyczasie
+
+        lo, hi = min(found), max(found)
+        through = lambda s: abs(self.kernel.y_at_x(s, x) - y) <= 1e-9
+        while lo > 0 and through(self.active_segments[lo - 1]): lo -= 1
+        while hi < len(self.active_segments) - 1 and through(self.active_segments[hi + 1]): hi += 1
+
+        self.active_segments[lo:hi + 1] = sorted(self.active_segments[lo:hi + 1], key=self.kernel.slope)
+        return lo, hi
+
+    def segments_in_range(self, y_lo, y_hi, x):
+        """Zwraca aktywne odcinki, których Y w punkcie x leży w przedziale [y_lo, y_hi]."""
+        self.current_x = x
+        y_key = lambda s: self.kernel.y_at_x(s, x)
+        lo = bisect.bisect_left(self.active_segments, y_lo - 1e-9, key=y_key)
+        hi = bisect.bisect_right(self.active_segments, y_hi + 1e-9, key=y_key)
+        return self.active_segments[lo:hi]
+
+    def get_neighbors_of_gap(self, idx):
+        """Zwraca odcinki po obu stronach luki po usuniętym elemencie o indeksie idx."""
+        prev_seg = self.active_segments[idx - 1] if idx > 0 else None
+        next_seg = self.active_segments[idx] if idx < len(self.active_segments) else None
+        return prev_seg, next_seg
 
     def get_neighbors_at_index(self, idx):
         """Zwraca sąsiada powyżej i poniżej podanego indeksu."""
@@ -67,9 +91,60 @@ class SweepLineStatus:
         next_seg = self.active_segments[idx + 1] if idx < len(self.active_segments) - 1 else None
         return prev_seg, next_seg
 
+# --- DEDUPLIKACJA PUNKTÓW (SIATKA Z TOLERANCJĄ) ---
+
+class ToleranceGrid:
+    """
+    Zbiór punktów przecięć porównywanych z tolerancją.
+
+    Punkty kwantyzujemy do komórek o boku `tol`. Punkt jest uznany za znany,
+    jeśli w jego komórce lub jednej z 8 sąsiednich leży punkt odległy o co
+    najwyżej `tol` (w każdej osi) - dzięki temu punkty różniące się tylko
+    ostatnimi bitami nie tworzą dwóch zdarzeń.
+
+    Komórki są grupowane w kolumny X. Kolumny, które miotła już minęła,
+    są usuwane (prune), więc pamięć zależy od frontu miotły, a nie od
+    łącznej liczby przecięć.
+    """
+    def __init__(self, tol=1e-9):
+        self.tol = tol
+        self.columns = {}      # cx -> {cy: [punkty]}
+        self.column_heap = []  # Kopiec indeksów kolumn (do usuwania od lewej)
+
+    def _cell(self, v):
+        return math.floor(v / self.tol)
+
+    def __contains__(self, pt):
+        cx, cy = self._cell(pt[0]), self._cell(pt[1])
+        for dx in (-1, 0, 1):
+            column = self.columns.get(cx + dx)
+            if not column: continue
+            for dy in (-1, 0, 1):
+                for q in column.get(cy + dy, ()):
+                    if abs(q[0] - pt[0]) <= self.tol and abs(q[1] - pt[1]) <= self.tol:
+                        return True
+        return False
+
+    def add(self, pt):
+        cx, cy = self._cell(pt[0]), self._cell(pt[1])
+        column = self.columns.get(cx)
+        if column is None:
+            column = self.columns[cx] = {}
+            heapq.heappush(self.column_heap, cx)
+        column.setdefault(cy, []).append(pt)
+
+    def prune(self, x):
+        """Usuwa punkty leżące wyraźnie na lewo od miotły (x < x_miotły - 2*tol)."""
+        limit = self._cell(x - 2 * self.tol)
+        while self.column_heap and self.column_heap[0] < limit:
+            del self.columns[heapq.heappop(self.column_heap)]
+
+    def __len__(self):
+        return sum(len(pts) for column in self.columns.values() for pts in column.values())
+
 # --- LOGIKA BENTLEY-OTTMANNA ---
 
-def check_future_intersection(s1, s2, current_x):
+def check_future_intersection(s1, s2, current_x, kernel=None):
     """
     Sprawdza, czy dwa odcinki (s1, s2) przetną się w PRZYSZŁOŚCI (x > current_x).
     Algorytm zamiatania interesuje się tylko tym, co jest przed miotłą.
@@ -77,37 +152,183 @@ def check_future_intersection(s1, s2, current_x):
     p1, p2 = s1.start.to_tuple(), s1.end.to_tuple()
     p3, p4 = s2.start.to_tuple(), s2.end.to_tuple()
     
-    pt = get_intersection_math(p1, p2, p3, p4)
+    kernel = kernel or get_kernel()
+    pt = kernel.get_intersection_math(p1, p2, p3, p4)
     
     if pt:
         # Sprawdź czy punkt leży fizycznie na odcinkach
-        if on_segment(pt, p1, p2) and on_segment(pt, p3, p4):
+        if kernel.on_segment(pt, p1, p2) and kernel.on_segment(pt, p3, p4):
             # Akceptujemy tylko zdarzenia na prawo od miotły (z małym marginesem błędu)
             if pt[0] >= current_x - 1e-9:
                 return Point(pt[0], pt[1])
     return None
 
-def run_sweep_line_algorithm(raw_segments):
+def _point_key(point):
+    """Klucz punktu w granicach tolerancji silnika (1e-9)."""
+    return (round(point.x, 9), round(point.y, 9))
+
+def _collinear(s1, s2, kernel):
+    """Współliniowość w tolerancji 1e-9 - to samo kryterium co w `find_intersection`."""
+    cross = kernel.cross((s1.end.x - s1.start.x, s1.end.y - s1.start.y),
+                         (s2.end.x - s2.start.x, s2.end.y - s2.start.y))
+    if abs(cross) >= 1e-9: return False
+    return abs(kernel.det(s2.start.to_tuple(), s2.end.to_tuple(), s1.start.to_tuple())) < 1e-9
+
+def collinear_overlap(s1, s2):
+    """
+    Część wspólna dwóch odcinków leżących na tej samej prostej.
+    Zwraca krotkę (początek, koniec) lub None, jeśli odcinki mają co najwyżej
+    jeden punkt wspólny (styk końcami jest zwykłym punktem, nie nakładaniem się).
+    """
+    start = max(s1.start, s2.start)
+    end = min(s1.end, s2.end)
+    if start < end and not start == end:
+        return (start.to_tuple(), end.to_tuple())
+    return None
+
+# Tryby pracy miotły
+MODE_POINTS = "POINTS" # Lista wszystkich punktów przecięcia
+MODE_COUNT = "COUNT"   # Tylko liczba przecięć (bez zapamiętywania punktów)
+MODE_ANY = "ANY"       # Czy istnieje jakiekolwiek przecięcie (Shamos-Hoey)
+
+def run_sweep_line_algorithm(raw_segments, on_point=None, splits=None, ignore_pair=None, overlaps=None):
     """
     Pełna implementacja algorytmu Bentley-Ottmanna dla N odcinków.
     Zwraca listę wszystkich znalezionych punktów przecięcia.
+
+    Opcjonalny `on_point` jest wywoływany z każdym punktem zaraz po jego
+    obsłużeniu przez miotłę (wyniki częściowe, np. do progresywnego rysowania).
+
+    Jeśli podano słownik `splits`, miotła dopisuje do niego punkty podziału
+    każdego odcinka: splits[id] = [punkty w kolejności od początku odcinka].
+    Dla odcinków niepionowych kolejność wynika z samego zamiatania (rosnące X);
+    punkty pionowego odcinka leżą w jednym X, więc są wstawiane według Y.
+
+    `ignore_pair(id_a, id_b)` pozwala pominąć pary odcinków już w trakcie
+    zamiatania (np. sąsiednie krawędzie łamanej stykające się w wierzchołku).
+
+    Jeśli podano listę `overlaps`, trafiają do niej nakładające się odcinki
+    współliniowe jako krotki (id_a, id_b, (początek, koniec)).
+    """
+    return _sweep(raw_segments, MODE_POINTS, on_point=on_point, splits=splits,
+                  ignore_pair=ignore_pair, overlaps=overlaps)
+
+def count_intersections(raw_segments, ignore_pair=None):
+    """
+    Zwraca liczbę punktów przecięcia bez tworzenia listy wyników.
+    """
+    return _sweep(raw_segments, MODE_COUNT, ignore_pair=ignore_pair)
+
+def has_intersection(raw_segments, ignore_pair=None):
+    """
+    Sprawdza, czy jakiekolwiek dwa odcinki się przecinają (algorytm Shamosa-Hoeya).
+    Nakładanie się odcinków współliniowych również jest przecięciem.
+    Kończy pracę przy pierwszym wykrytym przecięciu sąsiadów w statusie,
+    więc nie przetwarza zdarzeń przecięć - O(n log n) niezależnie od ich liczby.
     """
+    return _sweep(raw_segments, MODE_ANY, ignore_pair=ignore_pair)
+
+def _sweep(raw_segments, mode, on_point=None, splits=None, ignore_pair=None, overlaps=None):
+    """
+    Wspólna pętla zamiatania dla wszystkich trybów (MODE_POINTS, MODE_COUNT, MODE_ANY).
+    """
+    kernel = get_kernel() # Jądro ustalone na cały przebieg miotły
     event_queue = []
-    status = SweepLineStatus()
-    found_intersections = set() # Zapobiega duplikatom
-    found_points_list = []      # Wynikowa lista punktów
+    status = SweepLineStatus(kernel)
+    found_intersections = ToleranceGrid() # Zapobiega duplikatom (z tolerancją 1e-9)
+    found_points_list = []      # Wynikowa lista punktów (tylko MODE_POINTS)
+    found_count = 0
     
+    def schedule(a, b, x):
+        """
+        Sprawdza parę sąsiadów i dodaje zdarzenie przecięcia do kolejki.
+        Zwraca True, jeśli znaleziono nowe przecięcie.
+        """
+        if ignore_pair and ignore_pair(a.id, b.id): return False
+        pt = check_future_intersection(a, b, x, kernel)
+        if pt and pt.to_tuple() not in found_intersections:
+            found_intersections.add(pt.to_tuple())
+            # Przecięcie dotyczy tych dwóch konkretnych segmentów
+            heapq.heappush(event_queue, Event(pt.x, pt, Event.INTERSECTION, [a, b]))
+            return True
+        return False
+
+    def add_split(segment, pt):
+        """Dopisuje punkt podziału; dla pionowego odcinka wstawia go według Y."""
+        points = splits.setdefault(segment.id, [])
+        if abs(segment.end.x - segment.start.x) < 1e-9:
+            bisect.insort(points, pt, key=lambda p: p[1])
+        else:
+            points.append(pt)
+
+    # Odcinki współliniowe grupujemy po kanonicznym kluczu prostej.
+    # Dzięki temu nakładanie się wykrywamy bez względu na sąsiedztwo w statusie
+    # (get_intersection_math nie obsługuje prostych równoległych). Klucz jest
+    # tylko kubełkiem: przeglądamy też sąsiednie klucze, a współliniowość
+    # potwierdza `_collinear`.
+    track_overlaps = overlaps is not None or mode == MODE_ANY
+    key_digits = 6 # Kubełki grubsze niż tolerancja: błąd kierunku mnożony przez współrzędne
+    line_groups = {} # Klucz prostej -> aktywne odcinki na tej prostej
+
+    def register_on_line(segment):
+        """Porównuje odcinek z aktywnymi odcinkami na jego prostej. Zwraca True przy nakładaniu się."""
+        key = line_key(segment, key_digits)
+        if key is None: return False
+        found = False
+        for other in [s for k in line_keys_around(key, key_digits) for s in line_groups.get(k, ())]:
+            if ignore_pair and ignore_pair(other.id, segment.id): continue
+            if not _collinear(other, segment, kernel): continue
+            common = collinear_overlap(other, segment)
+            if common:
+                found = True
+                if overlaps is not None: overlaps.append((other.id, segment.id, common))
+        line_groups.setdefault(key, []).append(segment)
+        return found
+
+    def unregister_on_line(segment):
+        key = line_key(segment, key_digits)
+        group = line_groups.get(key)
+        if not group: return
+        group[:] = [s for s in group if s.id != segment.id]
+        if not group: del line_groups[key]
+
     # 1. INICJALIZACJA
     # Dodaj punkty początkowe i końcowe wszystkich odcinków do kolejki
     for i, (start, end) in enumerate(raw_segments):
         s = Segment(Point(*start), Point(*end), i)
+        if abs(s.end.x - s.start.x) < 1e-9:
+            # Odcinek pionowy obsługujemy jednym zdarzeniem (zapytanie o przedział Y)
+            heapq.heappush(event_queue, Event(s.start.x, s.start, Event.VERTICAL, [s]))
+            continue
         heapq.heappush(event_queue, Event(s.start.x, s.start, Event.START, [s]))
         heapq.heappush(event_queue, Event(s.end.x, s.end, Event.END, [s]))
 
+    verticals_at_x = [] # Pionowe odcinki w bieżącym X (dla odcinków startujących w tym X)
+    verticals_x = None
+    # Punkty przecięć w bieżącym X. PRZECIĘCIE jest obsługiwane przed PIONOWYM,
+    # więc punkt leżący na pionowym odcinku może zostać zgłoszony, zanim ten trafi do verticals_at_x.
+    points_at_x = []
+    points_x = None
+    # Odcinki zakończone w bieżącym X, według punktu końcowego. KONIEC jest obsługiwany
+    # przed POCZĄTKIEM, więc styk "koniec jednego = początek drugiego" sprawdzamy tutaj.
+    ended_at_x = {}
+    ended_x = None
+
     # 2. PĘTLA GŁÓWNA (SWEEP)
     while event_queue:
         event = heapq.heappop(event_queue)
         sweep_x = event.x
+        new_found = False
+        # Przecięcia na lewo od miotły nie mogą już zostać zgłoszone ponownie
+        found_intersections.prune(sweep_x)
+        if verticals_x is not None and sweep_x > verticals_x + 1e-9:
+            if track_overlaps:
+                for vertical in verticals_at_x: unregister_on_line(vertical)
+            verticals_at_x, verticals_x = [], None
+        if ended_x is not None and sweep_x > ended_x + 1e-9:
+            ended_at_x, ended_x = {}, None
+        if points_x is not None and sweep_x > points_x + 1e-9:
+            points_at_x, points_x = [], None
         
         # --- ZDARZENIE: START (Początek odcinka) ---
         if event.type == Event.START:
@@ -119,19 +340,35 @@ def run_sweep_line_algorithm(raw_segments):
             # Sprawdź przecięcia z nowymi sąsiadami (góra/dół)
             pred, succ = status.get_neighbors_at_index(idx)
             
-            if pred:
-                pt = check_future_intersection(segment, pred, sweep_x)
-                if pt and pt.to_tuple() not in found_intersections:
-                    found_intersections.add(pt.to_tuple())
-                    # Dodaj zdarzenie przecięcia do kolejki!
-                    # Przecięcie dotyczy tych dwóch konkretnych segmentów
-                    heapq.heappush(event_queue, Event(pt.x, pt, Event.INTERSECTION, [segment, pred]))
-            
-            if succ:
-                pt = check_future_intersection(segment, succ, sweep_x)
-                if pt and pt.to_tuple() not in found_intersections:
-                    found_intersections.add(pt.to_tuple())
-                    heapq.heappush(event_queue, Event(pt.x, pt, Event.INTERSECTION, [segment, succ]))
+            if pred and schedule(segment, pred, sweep_x): new_found = True
+            if succ and schedule(segment, succ, sweep_x): new_found = True
+
+            # Początek odcinka może leżeć na pionowym odcinku z tego samego X
+            for vertical in verticals_at_x:
+                if schedule(segment, vertical, sweep_x): new_found = True
+            # ... albo w punkcie, w którym właśnie skończył się inny odcinek
+            for ended in ended_at_x.get(_point_key(segment.start), ()):
+                if schedule(segment, ended, sweep_x): new_found = True
+
+            if track_overlaps and register_on_line(segment): new_found = True
+
+        # --- ZDARZENIE: VERTICAL (Odcinek pionowy) ---
+        elif event.type == Event.VERTICAL:
+            segment = event.segments[0]
+            verticals_at_x.append(segment)
+            verticals_x = sweep_x
+
+            # Pionowy odcinek przecina wszystkie aktywne odcinki o Y w jego zakresie.
+            # Sam nie trafia do statusu (jego Y nie jest funkcją X).
+            for other in status.segments_in_range(segment.start.y, segment.end.y, sweep_x):
+                if schedule(segment, other, sweep_x): new_found = True
+
+            if splits is not None:
+                for pt in points_at_x:
+                    if segment.start.y - 1e-9 <= pt[1] <= segment.end.y + 1e-9:
+                        add_split(segment, pt)
+
+            if track_overlaps and register_on_line(segment): new_found = True
 
         # --- ZDARZENIE: END (Koniec odcinka) ---
         elif event.type == Event.END:
@@ -139,78 +376,90 @@ def run_sweep_line_algorithm(raw_segments):
             
             # Pobierz sąsiadów zanim usuniemy odcinek
             idx = status.remove(segment, sweep_x)
+            if track_overlaps: unregister_on_line(segment)
+            ended_at_x.setdefault(_point_key(segment.end), []).append(segment)
+            ended_x = sweep_x
             
             # Po usunięciu, dawni sąsiedzi (góra i dół) stają się bezpośrednimi sąsiadami.
             # Musimy sprawdzić, czy ONI się nie przetną w przyszłości.
             if idx != -1:
                 # Uwaga na indeksy: po remove, element [idx] to dawny następnik, a [idx-1] to dawny poprzednik
-                pred, succ = status.get_neighbors_at_index(idx)
+                pred, succ = status.get_neighbors_of_gap(idx)
                 
-                if pred and succ:
-                    pt = check_future_intersection(pred, succ, sweep_x)
-                    if pt and pt.to_tuple() not in found_intersections:
-                        found_intersections.add(pt.to_tuple())
-                        heapq.heappush(event_queue, Event(pt.x, pt, Event.INTERSECTION, [pred, succ]))
+                if pred and succ and schedule(pred, succ, sweep_x): new_found = True
 
         # --- ZDARZENIE: INTERSECTION (Przecięcie dwóch odcinków) ---
         elif event.type == Event.INTERSECTION:
             # To jest serce pełnego algorytmu Bentley-Ottmanna.
             # Zapisujemy znaleziony punkt
-            found_points_list.append(event.point.to_tuple())
-            
-            # Pobieramy dwa odcinki, które się przecięły
-            s1 = event.segments[0]
-            s2 = event.segments[1]
+            found_count += 1
+            if mode == MODE_POINTS:
+                found_points_list.append(event.point.to_tuple())
+            if on_point: on_point(event.point.to_tuple())
             
-            # Zamieniamy je miejscami w strukturze statusu.
+            # Porządkujemy odcinki przechodzące przez punkt w strukturze statusu.
             # Ponieważ się przecięły, ich relacja góra/dół się odwraca.
-            status.swap_segments(s1, s2)
+            block = status.reorder_at_point(event.segments, event.point.x, event.point.y)
+            through_point = list(event.segments)
+            if block:
+                lo, hi = block
+                through_point += [seg for seg in status.active_segments[lo:hi + 1]
+                                  if seg not in through_point]
+            # Pionowe odcinki nie są w statusie - dołączamy te, na których leży punkt
+            through_point += [seg for seg in verticals_at_x if seg not in through_point and
+                              seg.start.y - 1e-9 <= event.point.y <= seg.end.y + 1e-9]
+
+            if splits is not None:
+                for seg in through_point:
+                    add_split(seg, event.point.to_tuple())
+                points_at_x.append(event.point.to_tuple())
+                points_x = sweep_x
             
-            # Po zamianie s1 i s2 mają nowych sąsiadów z "zewnątrz".
+            # Po zamianie skrajne odcinki bloku mają nowych sąsiadów z "zewnątrz".
             # Trzeba sprawdzić nowe potencjalne przecięcia:
-            # - Górny zamieniony vs Jego górny sąsiad
-            # - Dolny zamieniony vs Jego dolny sąsiad
-            
-            for seg in [s1, s2]:
-                pred, succ = status.get_neighbors_by_segment(seg)
-                if pred:
-                    pt = check_future_intersection(seg, pred, sweep_x)
-                    if pt and pt.to_tuple() not in found_intersections:
-                        found_intersections.add(pt.to_tuple())
-                        heapq.heappush(event_queue, Event(pt.x, pt, Event.INTERSECTION, [seg, pred]))
-                if succ:
-                    pt = check_future_intersection(seg, succ, sweep_x)
-                    if pt and pt.to_tuple() not in found_intersections:
-                        found_intersections.add(pt.to_tuple())
-                        heapq.heappush(event_queue, Event(pt.x, pt, Event.INTERSECTION, [seg, succ]))
+            # - Górny odcinek bloku vs Jego górny sąsiad
+            # - Dolny odcinek bloku vs Jego dolny sąsiad
+            if block:
+                lo, hi = block
+                below, above = status.get_neighbors_at_index(lo)[0], status.get_neighbors_at_index(hi)[1]
+                if below: schedule(status.active_segments[lo], below, sweep_x)
+                if above: schedule(status.active_segments[hi], above, sweep_x)
+
+        # Shamos-Hoey: wystarczy pierwsze przecięcie sąsiadów w statusie
+        if mode == MODE_ANY and new_found:
+            return True
 
+    if mode == MODE_ANY: return False
+    if mode == MODE_COUNT: return found_count
     return found_points_list
 
 # --- FASADA (WRAPPER) ---
 
-def find_intersection(P1, P2, P3, P4, infinite=False):
+def find_intersection(P1, P2, P3, P4, infinite=False, on_point=None):
     """
     Wrapper dostosowujący ogólny algorytm (dla N odcinków) 
     do interfejsu GUI (oczekującego wyniku dla 2 odcinków).
+    `on_point` jest przekazywany do miotły (wyniki częściowe).
     """
+    kernel = get_kernel()
     
     # 1. Obsługa przypadków zdegenerowanych (Równoległość/Overlap)
     vec1 = (P2[0]-P1[0], P2[1]-P1[1])
     vec2 = (P4[0]-P3[0], P4[1]-P3[1])
-    cross_prod = vec1[0]*vec2[1] - vec1[1]*vec2[0]
+    cross_prod = kernel.cross(vec1, vec2)
 
     if abs(cross_prod) < 1e-9:  
         if infinite: return "NONE", None
         
         # Sprawdzamy współliniowość
-        d1 = det(P3, P4, P1)
+        d1 = kernel.det(P3, P4, P1)
         if abs(d1) < 1e-9:
             # Overlap logic
             overlap = []
-            if on_segment(P1, P3, P4): overlap.append(P1)
-            if on_segment(P2, P3, P4): overlap.append(P2)
-            if on_segment(P3, P1, P2): overlap.append(P3)
-            if on_segment(P4, P1, P2): overlap.append(P4)
+            if kernel.on_segment(P1, P3, P4): overlap.append(P1)
+            if kernel.on_segment(P2, P3, P4): overlap.append(P2)
+            if kernel.on_segment(P3, P1, P2): overlap.append(P3)
+            if kernel.on_segment(P4, P1, P2): overlap.append(P4)
             overlap = sorted(list(set(overlap)))
             if len(overlap) >= 2:
                 return "SEGMENT", (overlap[0], overlap[-1])
@@ -220,12 +469,12 @@ def find_intersection(P1, P2, P3, P4, infinite=False):
 
     # 2. Tryb Nieskończony
     if infinite:
-        pt = get_intersection_math(P1, P2, P3, P4)
+        pt = kernel.get_intersection_math(P1, P2, P3, P4)
         if pt: return "POINT", pt
         return "NONE", None
 
     # 3. Uruchomienie Bentley-Ottmanna
-    results = run_sweep_line_algorithm([ (P1, P2), (P3, P4) ])
+    results = run_sweep_line_algorithm([ (P1, P2), (P3, P4) ], on_point=on_point)
     
     if results:
         # GUI obsługuje na razie wyświetlanie jednego punktu, zwracamy pierwszy znaleziony
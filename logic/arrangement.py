@@ -0,0 +1,135 @@
+import math
+from .algorithm import run_sweep_line_algorithm
+from .primitives import Point
+
+# --- ARANŻACJA ODCINKÓW (GRAF PLANARNY / DCEL) ---
+
+def _vertex_key(p):
+    """Klucz wierzchołka - zaokrąglenie do tolerancji silnika (1e-9)."""
+    return (round(p[0], 9), round(p[1], 9))
+
+class Arrangement:
+    """
+    Kompaktowa struktura półkrawędzi (DCEL) dla zbioru odcinków.
+
+    Półkrawędzie przechowujemy w równoległych listach indeksowanych numerem
+    półkrawędzi. Bliźniaki tworzą pary (2k, 2k+1), więc twin(e) = e ^ 1
+    nie wymaga osobnego pola.
+    - vertices:   lista punktów (x, y)
+    - he_origin:  wierzchołek początkowy półkrawędzi
+    - he_next:    następna półkrawędź na brzegu tej samej ściany
+    - he_face:    numer ściany po lewej stronie półkrawędzi
+    - he_segment: id odcinka wejściowego, z którego pochodzi krawędź
+    - faces:      dla każdej ściany jedna półkrawędź z jej brzegu
+    - splits:     punkty podziału wnętrza każdego odcinka (splits[id])
+
+    Każdy spójny składnik ma własną ścianę zewnętrzną (otwory nie są łączone).
+    """
+    def __init__(self):
+        self.vertices = []
+        self.he_origin = []
+        self.he_next = []
+        self.he_face = []
+        self.he_segment = []
+        self.faces = []
+        self.splits = {}
+
+    @staticmethod
+    def twin(e):
+        return e ^ 1
+
+    def destination(self, e):
+        return self.he_origin[e ^ 1]
+
+    def edges(self):
+        """Zwraca krawędzie grafu jako pary indeksów wierzchołków."""
+        return [(self.he_origin[e], self.he_origin[e + 1]) for e in range(0, len(self.he_origin), 2)]
+
+    def face_boundary(self, f):
+        """Zwraca wierzchołki (x, y) brzegu ściany f w kolejności obiegu."""
+        start = self.faces[f]
+        boundary = [self.vertices[self.he_origin[start]]]
+        e = self.he_next[start]
+        while e != start:
+            boundary.append(self.vertices[self.he_origin[e]])
+            e = self.he_next[e]
+        return boundary
+
+def build_arrangement(raw_segments):
+    """
+    Dzieli odcinki w punktach przecięcia i buduje graf planarny (DCEL).
+
+    Punkty podziału zbiera sam algorytm zamiatania (parametr `splits`),
+    już uporządkowane wzdłuż każdego odcinka (pionowe - według Y) - nie ma
+    drugiego przebiegu z dopasowywaniem punktów do odcinków.
+
+    Odcinki współliniowe dzielimy dodatkowo w końcach ich części wspólnej
+    (parametr `overlaps`), więc wspólny fragment daje te same podkrawędzie
+    i trafia do grafu tylko raz.
+    """
+    arr = Arrangement()
+    overlaps = []
+    run_sweep_line_algorithm(raw_segments, splits=arr.splits, overlaps=overlaps)
+
+    # Końce części wspólnych dokładamy do podziałów obu odcinków; porządek
+    # leksykograficzny (X, potem Y) to kolejność od początku odcinka
+    for id_a, id_b, common in overlaps:
+        for seg_id in (id_a, id_b):
+            ends = {_vertex_key(p) for p in raw_segments[seg_id]}
+            inner = [p for p in common if _vertex_key(p) not in ends]
+            if inner: arr.splits[seg_id] = sorted(arr.splits.get(seg_id, []) + inner)
+
+    vertex_ids = {}
+    def vertex(p):
+        key = _vertex_key(p)
+        if key not in vertex_ids:
+            vertex_ids[key] = len(arr.vertices)
+            arr.vertices.append(p)
+        return vertex_ids[key]
+
+    # 1. KRAWĘDZIE: kolejne punkty podziału wzdłuż każdego odcinka
+    seen_edges = set()
+    for seg_id, (a, b) in enumerate(raw_segments):
+        # Kierunek zgodny z miotłą (Segment zawsze zaczyna się od mniejszego punktu)
+        start, end = (a, b) if Point(*a) < Point(*b) else (b, a)
+        chain = [vertex(start)]
+        for p in arr.splits.get(seg_id, []):
+            chain.append(vertex(p))
+        chain.append(vertex(end))
+
+        for u, v in zip(chain, chain[1:]):
+            if u == v: continue # Podział w końcu odcinka lub zdublowany punkt
+            if (min(u, v), max(u, v)) in seen_edges: continue # Wspólny fragment odcinków współliniowych
+            seen_edges.add((min(u, v), max(u, v)))
+            arr.he_origin += [u, v]
+            arr.he_segment += [seg_id, seg_id]
+
+    # 2. POWIĄZANIA NEXT: półkrawędzie wychodzące z wierzchołka sortujemy kątowo.
+    # Półkrawędź wchodząca twin(e) kontynuuje się krawędzią poprzedzającą e
+    # w porządku przeciwnym do ruchu wskazówek zegara (ściana zostaje po lewej).
+    outgoing = [[] for _ in arr.vertices]
+    for e, v in enumerate(arr.he_origin):
+        outgoing[v].append(e)
+
+    arr.he_next = [None] * len(arr.he_origin)
+    for v, edges in enumerate(outgoing):
+        vx, vy = arr.vertices[v]
+        def angle(e):
+            wx, wy = arr.vertices[arr.destination(e)]
+            return math.atan2(wy - vy, wx - vx)
+        edges.sort(key=angle)
+        for i, e in enumerate(edges):
+            arr.he_next[e ^ 1] = edges[i - 1]
+
+    # 3. ŚCIANY: cykle po wskaźnikach next
+    arr.he_face = [None] * len(arr.he_origin)
+    for start in range(len(arr.he_origin)):
+        if arr.he_face[start] is not None: continue
+        f = len(arr.faces)
+        arr.faces.append(start)
+        e = start
+        while arr.he_face[e] is None:
+            arr.he_face[e] = f
+            e = arr.he_next[e]
+
+    return arr
@@ -0,0 +1,191 @@
+from . import math_utils
+
+try:
+    import numpy as np
+except ImportError: # Backend NumPy i operacje wsadowe są opcjonalne
+    np = None
+
+try:
+    import numba
+except ImportError: # Kompilowane predykaty są opcjonalne
+    numba = None
+
+# --- JĄDRA OBLICZENIOWE (BACKENDY PREDYKATÓW) ---
+#
+# Jądro dostarcza predykaty, przez które przechodzą wszystkie porównania
+# w zamiataniu i w fasadzie dla dwóch odcinków:
+#   det(a, b, c), cross(u, v), on_segment(p, a, b), y_at_x(segment, x),
+#   slope(segment), get_intersection_math(P1, P2, P3, P4)
+# oraz prymitywy wsadowe (tablice NumPy) dla API wsadowych:
+#   line_intersections_block(a, b) -> (ii, jj, x, y)
+#   segment_distances(q, segs)     -> macierz odległości (len(q), len(segs))
+
+class PythonKernel:
+    """
+    Referencyjne jądro w czystym Pythonie (funkcje z math_utils).
+    Prymitywy wsadowe są tu zwykłymi pętlami po predykatach skalarnych -
+    wolnymi, ale służącymi jako wzorzec przy porównaniu backendów.
+    """
+    name = "python"
+
+    det = staticmethod(math_utils.det)
+    cross = staticmethod(math_utils.cross)
+    on_segment = staticmethod(math_utils.on_segment)
+    y_at_x = staticmethod(math_utils.y_at_x)
+    slope = staticmethod(math_utils.slope)
+    get_intersection_math = staticmethod(math_utils.get_intersection_math)
+
+    def line_intersections_block(self, a, b):
+        """
+        Przecięcia prostych z bloków a (p, 4) i b (q, 4), wiersz = (x1, y1, x2, y2).
+        Zwraca indeksy par (ii w a, jj w b) i współrzędne punktów; pary równoległe są pomijane.
+        """
+        ii, jj, xs, ys = [], [], [], []
+        b_rows = b.tolist()
+        for i, (x1, y1, x2, y2) in enumerate(a.tolist()):
+            for j, (x3, y3, x4, y4) in enumerate(b_rows):
+                pt = self.get_intersection_math((x1, y1), (x2, y2), (x3, y3), (x4, y4))
+                if pt:
+                    ii.append(i)
+                    jj.append(j)
+                    xs.append(pt[0])
+                    ys.append(pt[1])
+        return (np.asarray(ii, dtype=np.intp), np.asarray(jj, dtype=np.intp),
+                np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+
+    def segment_distances(self, q, segs):
+        """Macierz odległości punktów q (m, 2) od odcinków segs (s, 4)."""
+        seg_rows = [((x1, y1), (x2, y2)) for x1, y1, x2, y2 in segs.tolist()]
+        return np.asarray([[math_utils.distance_point_to_segment(p, a, b) for a, b in seg_rows]
+                           for p in q.tolist()], dtype=float).reshape(len(q), len(seg_rows))
+
+class NumpyKernel(PythonKernel):
+    """
+    Jądro z wektorowymi (broadcasting) prymitywami wsadowymi.
+    Predykaty skalarne dziedziczy z PythonKernel - pojedyncze liczby
+    w NumPy są wolniejsze od zwykłych floatów Pythona.
+    """
+    name = "numpy"
+
+    def line_intersections_block(self, a, b):
+        x1, y1 = a[:, 0:1], a[:, 1:2]
+        dxa, dya = a[:, 2:3] - x1, a[:, 3:4] - y1
+        x3, y3 = b[:, 0], b[:, 1]
+        dxb, dyb = b[:, 2] - x3, b[:, 3] - y3
+
+        # Ten sam wzór co w get_intersection_math, dla całego bloku naraz
+        denom = dyb * dxa - dxb * dya
+        ii, jj = np.nonzero(np.abs(denom) >= 1e-9)
+        ua = (dxb[jj] * (y1[ii, 0] - y3[jj]) - dyb[jj] * (x1[ii, 0] - x3[jj])) / denom[ii, jj]
+        x = x1[ii, 0] + ua * dxa[ii, 0]
+        y = y1[ii, 0] + ua * dya[ii, 0]
+        return ii, jj, x, y
+
+    def segment_distances(self, q, segs):
+        # Macierzowa wersja distance_point_to_segment
+        px, py = q[:, None, 0], q[:, None, 1]
+        x1, y1, x2, y2 = segs[None, :, 0], segs[None, :, 1], segs[None, :, 2], segs[None, :, 3]
+        dx, dy = x2 - x1, y2 - y1
+        length_sq = dx * dx + dy * dy
+        degenerate = length_sq == 0
+        t = ((px - x1) * dx + (py - y1) * dy) / np.where(degenerate, 1, length_sq)
+        t = np.where(degenerate, 0, np.clip(t, 0, 1))
+        return np.hypot(px - (x1 + t * dx), py - (y1 + t * dy))
+
+if numba is not None:
+    # Wersje predykatów na samych liczbach - Numba kompiluje je do kodu maszynowego
+    @numba.njit
+    def _det_jit(ax, ay, bx, by, cx, cy):
+        return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+    @numba.njit
+    def _cross_jit(ux, uy, vx, vy):
+        return ux * vy - uy * vx
+
+    @numba.njit
+    def _on_segment_jit(px, py, ax, ay, bx, by):
+        if abs((bx - ax) * (py - ay) - (by - ay) * (px - ax)) > 1e-9:
+            return False
+        return (min(ax, bx) - 1e-9 <= px <= max(ax, bx) + 1e-9 and
+                min(ay, by) - 1e-9 <= py <= max(ay, by) + 1e-9)
+
+    @numba.njit
+    def _y_at_x_jit(x1, y1, x2, y2, x):
+        if abs(x2 - x1) < 1e-9: return y1 # Pionowy
+        return y1 + (y2 - y1) / (x2 - x1) * (x - x1)
+
+    @numba.njit
+    def _slope_jit(x1, y1, x2, y2):
+        if abs(x2 - x1) < 1e-9: return np.inf # Pionowy
+        return (y2 - y1) / (x2 - x1)
+
+    @numba.njit
+    def _intersection_jit(x1, y1, x2, y2, x3, y3, x4, y4):
+        # Zwraca (czy_istnieje, x, y) - Numba nie zwraca wygodnie None
+        denom = (y4 - y3) * (x2 - x1) - (x4 - x3) * (y2 - y1)
+        if abs(denom) < 1e-9: return False, 0.0, 0.0
+        ua = ((x4 - x3) * (y1 - y3) - (y4 - y3) * (x1 - x3)) / denom
+        return True, x1 + ua * (x2 - x1), y1 + ua * (y2 - y1)
+
+    class NumbaKernel(NumpyKernel):
+        """
+        Jądro z predykatami skalarnymi skompilowanymi przez Numbę (JIT).
+        Dostępne tylko, gdy pakiet numba jest zainstalowany.
+        """
+        name = "numba"
+
+        @staticmethod
+        def det(a, b, c):
+            return _det_jit(float(a[0]), float(a[1]), float(b[0]), float(b[1]), float(c[0]), float(c[1]))
+
+        @staticmethod
+        def cross(u, v):
+            return _cross_jit(float(u[0]), float(u[1]), float(v[0]), float(v[1]))
+
+        @staticmethod
+        def on_segment(p, a, b):
+            return _on_segment_jit(float(p[0]), float(p[1]), float(a[0]), float(a[1]), float(b[0]), float(b[1]))
+
+        @staticmethod
+        def y_at_x(segment, x):
+            return _y_at_x_jit(float(segment.start.x), float(segment.start.y),
+                               float(segment.end.x), float(segment.end.y), float(x))
+
+        @staticmethod
+        def slope(segment):
+            return _slope_jit(float(segment.start.x), float(segment.start.y),
+                              float(segment.end.x), float(segment.end.y))
+
+        @staticmethod
+        def get_intersection_math(P1, P2, P3, P4):
+            ok, x, y = _intersection_jit(float(P1[0]), float(P1[1]), float(P2[0]), float(P2[1]),
+                                         float(P3[0]), float(P3[1]), float(P4[0]), float(P4[1]))
+            return (x, y) if ok else None
+
+# --- WYBÓR JĄDRA ---
+
+_KERNELS = {"python": PythonKernel}
+if np is not None:
+    _KERNELS["numpy"] = NumpyKernel
+if numba is not None and np is not None:
+    _KERNELS["numba"] = NumbaKernel
+
+# Domyślnie NumPy (jeśli jest): predykaty skalarne są identyczne z referencyjnymi,
+# a operacje wsadowe - wektorowe
+_current = NumpyKernel() if np is not None else PythonKernel()
+
+def available_kernels():
+    """Nazwy jąder dostępnych w bieżącym środowisku."""
+    return list(_KERNELS)
+
+def get_kernel():
+    """Zwraca aktualnie wybrane jądro."""
+    return _current
+
+def set_kernel(name):
+    """Wybiera jądro po nazwie ("python", "numpy", "numba")."""
+    global _current
+    if name not in _KERNELS:
+        raise ValueError(f"Nieznane lub niedostępne jądro: {name!r} (dostępne: {available_kernels()})")
+    _current = _KERNELS[name]()
+    return _current
@@ -0,0 +1,174 @@
+import itertools
+import math
+from .algorithm import run_sweep_line_algorithm
+from .kernels import get_kernel
+
+# --- TRYB KINETYCZNY (RUCHOME ODCINKI) ---
+
+def _pair_key(i, j):
+    return (i, j) if i < j else (j, i)
+
+def _bbox(segment):
+    (x1, y1), (x2, y2) = segment
+    return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+class KineticIntersections:
+    """
+    Przecięcia zbioru odcinków śledzone w kolejnych klatkach czasu.
+
+    Pierwsza klatka to zwykłe zamiatanie Bentleya-Ottmanna; odcinki przechodzące
+    przez każdy znaleziony punkt dają zbiór przecinających się par (`pairs`,
+    id_a < id_b -> punkt). W kolejnych klatkach zbiór par
+    jest naprawiany, a nie liczony od nowa: para dwóch nieruchomych odcinków
+    nie może zmienić stanu, więc ponownie sprawdzamy tylko pary z udziałem
+    przesuniętych odcinków. Kandydatów do takich par dostarcza siatka
+    kubełków (prostokąty ograniczające odcinków), więc koszt klatki zależy
+    od liczby i otoczenia przesuniętych odcinków, a nie od n log n.
+
+    Gdy w klatce poruszy się więcej niż `rebuild_fraction` odcinków,
+    taniej jest wykonać pełne zamiatanie - wtedy stan budujemy od nowa.
+
+    Odcinek, którego prostokąt zajmuje więcej niż `max_cells` kubełków
+    (np. długa przekątna przy małych kubełkach), nie trafia do siatki, tylko
+    na listę `overflow`, sprawdzaną zawsze. Dzięki temu koszt wstawienia
+    jest ograniczony niezależnie od stosunku długości odcinka do kubełka.
+    """
+    def __init__(self, segments, cell_size=None, rebuild_fraction=0.5, max_cells=64):
+        self.rebuild_fraction = rebuild_fraction
+        self.max_cells = max_cells
+        self.fixed_cell_size = cell_size # None - dobierany przy każdej przebudowie
+        self.last_checked = 0 # Liczba par sprawdzonych w ostatniej klatce
+        self._rebuild(segments)
+
+    # --- BUDOWA STANU ---
+
+    def _rebuild(self, segments):
+        self.segments = [(tuple(a), tuple(b)) for a, b in segments]
+        self.cell_size = self.fixed_cell_size or self._auto_cell_size()
+        self.cells = {}
+        self.segment_cells = {}
+        self.overflow = set()
+        for i in range(len(self.segments)):
+            self._grid_insert(i)
+
+        # Miotła znajduje punkty, a siatka wskazuje odcinki przechodzące przez każdy z nich
+        self.pairs = {}
+        self.partners = {i: set() for i in range(len(self.segments))}
+        checked = set()
+        kernel = get_kernel()
+        for x, y in run_sweep_line_algorithm(self.segments):
+            through = {i for i in self.overflow if kernel.on_segment((x, y), *self.segments[i])}
+            for cell in self._cells_of(((x - 1e-9, y - 1e-9), (x + 1e-9, y + 1e-9))):
+                for i in self.cells.get(cell, ()):
+                    if kernel.on_segment((x, y), *self.segments[i]): through.add(i)
+            through = sorted(through)
+            for a, i in enumerate(through):
+                for j in through[a + 1:]:
+                    if (i, j) not in checked:
+                        checked.add((i, j))
+                        self._check_pair(i, j)
+        self.last_checked = len(checked)
+
+    def _auto_cell_size(self):
+        """Kubełek wielkości typowego odcinka (średni dłuższy bok prostokąta)."""
+        extents = [max(b[2] - b[0], b[3] - b[1]) for b in map(_bbox, self.segments)]
+        size = sum(extents) / len(extents) if extents else 0.0
+        # Same odcinki zerowej długości - kubełek 1.0 zamiast 1e-9
+        return size if size > 1e-9 else 1.0
+
+    def _cells_of(self, segment, limit=None):
+        """Kubełki prostokąta odcinka; None, jeśli jest ich więcej niż `limit`."""
+        x_min, y_min, x_max, y_max = _bbox(segment)
+        c = self.cell_size
+        cx_lo, cx_hi = math.floor(x_min / c), math.floor(x_max / c)
+        cy_lo, cy_hi = math.floor(y_min / c), math.floor(y_max / c)
+        if limit is not None and (cx_hi - cx_lo + 1) * (cy_hi - cy_lo + 1) > limit:
+            return None
+        return [(cx, cy) for cx in range(cx_lo, cx_hi + 1) for cy in range(cy_lo, cy_hi + 1)]
+
+    def _grid_insert(self, i):
+        cells = self._cells_of(self.segments[i], self.max_cells)
+        if cells is None:
+            self.overflow.add(i)
+            cells = []
+        self.segment_cells[i] = cells
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(i)
+
+    def _grid_remove(self, i):
+        self.overflow.discard(i)
+        for cell in self.segment_cells.pop(i, ()):
+            bucket = self.cells[cell]
+            bucket.discard(i)
+            if not bucket: del self.cells[cell]
+
+    # --- KLATKI ---
+
+    def _check_pair(self, i, j):
+        """Dokładny test pary (te same predykaty co w zamiataniu); zapisuje parę, jeśli się przecina."""
+        kernel = get_kernel()
+        p1, p2 = self.segments[i]
+        p3, p4 = self.segments[j]
+        pt = kernel.get_intersection_math(p1, p2, p3, p4)
+        if pt and kernel.on_segment(pt, p1, p2) and kernel.on_segment(pt, p3, p4):
+            self.pairs[_pair_key(i, j)] = pt
+            self.partners[i].add(j)
+            self.partners[j].add(i)
+
+    def move(self, moved):
+        """
+        Przesuwa odcinki: moved = {id: (P1, P2)}. Naprawia zbiór par,
+        sprawdzając wyłącznie pary z udziałem przesuniętych odcinków.
+        """
+        if len(moved) > self.rebuild_fraction * len(self.segments):
+            segments = list(self.segments)
+            for i, seg in moved.items():
+                segments[i] = seg
+            self._rebuild(segments)
+            return
+
+        # 1. Usuwamy stare pary i stare położenie w siatce
+        for i in moved:
+            for j in self.partners[i]:
+                self.pairs.pop(_pair_key(i, j), None) # Para dwóch przesuniętych - usuwana raz
+                if j not in moved: self.partners[j].discard(i)
+            self.partners[i] = set()
+            self._grid_remove(i)
+        for i, seg in moved.items():
+            self.segments[i] = (tuple(seg[0]), tuple(seg[1]))
+            self._grid_insert(i)
+
+        # 2. Sprawdzamy przesunięte odcinki tylko z kandydatami z tych samych kubełków
+        #    oraz z listy overflow; odcinek z overflow sprawdzamy ze wszystkimi
+        checked = set()
+        for i in moved:
+            if i in self.overflow:
+                candidates = range(len(self.segments))
+            else:
+                candidates = itertools.chain(self.overflow, *(self.cells[cell] for cell in self.segment_cells[i]))
+            for j in candidates:
+                key = _pair_key(i, j)
+                if i == j or key in checked: continue
+                checked.add(key)
+                self._check_pair(i, j)
+        self.last_checked = len(checked)
+
+    def update(self, segments):
+        """
+        Przyjmuje pełną listę odcinków nowej klatki (te same id - ta sama kolejność),
+        wykrywa przesunięte odcinki i naprawia stan przez `move`.
+        """
+        segments = [(tuple(a), tuple(b)) for a, b in segments]
+        if len(segments) != len(self.segments):
+            self._rebuild(segments)
+            return
+        moved = {i: seg for i, seg in enumerate(segments) if seg != self.segments[i]}
+        if moved: self.move(moved)
+        else: self.last_checked = 0
+
+    def points(self):
+        """Punkty przecięć bieżącej klatki (bez duplikatów, np. dla punktów potrójnych)."""
+        unique = {}
+        for pt in self.pairs.values():
+            unique.setdefault((round(pt[0], 9), round(pt[1], 9)), pt)
+        return list(unique.values())
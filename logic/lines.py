@@ -0,0 +1,59 @@
+try:
+    import numpy as np
+except ImportError: # NumPy jest potrzebny tylko dla wsadowych API
+    np = None
+
+from .kernels import get_kernel
+
+# --- WSADOWE PRZECIĘCIA PROSTYCH (TRYB NIESKOŃCZONY) ---
+
+def _as_line_array(lines):
+    """Zamienia listę prostych [(P1, P2), ...] na tablicę o kształcie (n, 4)."""
+    if np is None:
+        raise ImportError("Wsadowe przecięcia prostych wymagają pakietu NumPy")
+    arr = np.asarray(lines, dtype=float)
+    return arr.reshape(len(arr), 4)
+
+def iter_line_intersections(lines, bbox=None, chunk_size=512):
+    """
+    Generator przecięć wszystkich par prostych, liczonych blokami.
+
+    Każda prosta jest zadana dwoma punktami (P1, P2). Pary (i, j), i < j,
+    są liczone w blokach chunk_size x chunk_size prymitywem
+    `line_intersections_block` wybranego jądra (w NumPy - broadcasting),
+    więc pamięć robocza nie zależy od liczby prostych. Wzór jest ten sam
+    co w `get_intersection_math` (proste równoległe, |denom| < 1e-9, są pomijane).
+
+    bbox = (x_min, y_min, x_max, y_max) zostawia tylko punkty z prostokąta.
+    Zwraca kolejno krotki (pairs, points): tablice o kształtach (k, 2).
+    """
+    arr = _as_line_array(lines)
+    kernel = get_kernel()
+    n = len(arr)
+    for i0 in range(0, n, chunk_size):
+        a = arr[i0:i0 + chunk_size]
+        for j0 in range(i0, n, chunk_size):
+            ii, jj, x, y = kernel.line_intersections_block(a, arr[j0:j0 + chunk_size])
+            if j0 == i0:
+                keep = ii < jj # Tylko pary i < j
+                ii, jj, x, y = ii[keep], jj[keep], x[keep], y[keep]
+
+            if bbox is not None:
+                x_min, y_min, x_max, y_max = bbox
+                keep = (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+                ii, jj, x, y = ii[keep], jj[keep], x[keep], y[keep]
+            if len(ii) == 0: continue
+
+            yield np.column_stack((ii + i0, jj + j0)), np.column_stack((x, y))
+
+def line_arrangement(lines, bbox=None, chunk_size=512):
+    """
+    Wszystkie przecięcia par prostych jako tablice:
+    pairs (k, 2) - indeksy prostych, points (k, 2) - współrzędne (x, y).
+    Przy dużej liczbie wyników lepiej iterować `iter_line_intersections`.
+    """
+    blocks = list(iter_line_intersections(lines, bbox=bbox, chunk_size=chunk_size))
+    if not blocks:
+        return np.empty((0, 2), dtype=np.intp), np.empty((0, 2), dtype=float)
+    pairs, points = zip(*blocks)
+    return np.concatenate(pairs), np.concatenate(points)
@@ -4,6 +4,10 @@ def det(a, b, c):
     """Oblicza iloczyn wektorowy (orientację punktu względem odcinka)."""
     return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
 
+def cross(u, v):
+    """Iloczyn wektorowy dwóch wektorów - zero dla wektorów równoległych."""
+    return u[0] * v[1] - u[1] * v[0]
+
 def on_segment(p, a, b):
     """
     Sprawdza, czy punkt p leży fizycznie na odcinku ab.
@@ -34,6 +38,44 @@ def y_at_x(segment, x):
     m = (y2 - y1) / (x2 - x1)
     return y1 + m * (x - x1)
 
+def slope(segment):
+    """
+    Zwraca nachylenie odcinka (dy/dx). Odcinek pionowy ma nachylenie +inf.
+    Rozstrzyga kolejność w statusie, gdy odcinki mają to samo Y w punkcie miotły.
+    """
+    dx = segment.end.x - segment.start.x
+    if abs(dx) < 1e-9: return math.inf # Pionowy
+    return (segment.end.y - segment.start.y) / dx
+
+def line_key(segment, ndigits=9):
+    """
+    Kanoniczny klucz prostej zawierającej odcinek: (ux, uy, c).
+    (ux, uy) to znormalizowany kierunek (ux > 0 lub pionowo w górę),
+    c - przesunięcie prostej wzdłuż normalnej. Wartości zaokrąglamy,
+    aby odcinki współliniowe w granicach tolerancji miały ten sam klucz.
+    Dla odcinka zdegenerowanego (punktu) zwraca None.
+    """
+    dx = segment.end.x - segment.start.x
+    dy = segment.end.y - segment.start.y
+    length = math.hypot(dx, dy)
+    if length < 1e-9: return None
+    ux, uy = dx / length, dy / length
+    # Prawie pionowe kierunki (ux zaokrąglone do 0) zawsze skierowane w górę
+    if ux < 0 or (round(ux, ndigits) == 0 and uy < 0): ux, uy = -ux, -uy
+    c = ux * segment.start.y - uy * segment.start.x
+    return (round(ux, ndigits) + 0.0, round(uy, ndigits) + 0.0, round(c, ndigits) + 0.0)
+
+def line_keys_around(key, ndigits=9):
+    """
+    Klucz `key` z `line_key` i jego 26 sąsiadów (±1 krok zaokrąglenia w każdej
+    składowej). Prawie równe wartości mogą zostać zaokrąglone w przeciwne strony
+    granicy, więc odcinki współliniowe trzeba szukać także w sąsiednich kluczach.
+    """
+    step = 10.0 ** -ndigits
+    return [(round(key[0] + i * step, ndigits) + 0.0, round(key[1] + j * step, ndigits) + 0.0,
+             round(key[2] + k * step, ndigits) + 0.0)
+            for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)]
+
 def get_intersection_math(P1, P2, P3, P4):
     """Analityczne wyznaczenie przecięcia prostych (Cramer)."""
     x1, y1 = P1
@@ -49,6 +91,24 @@ def get_intersection_math(P1, P2, P3, P4):
     y = y1 + ua * (y2 - y1)
     return (x, y)
 
+def point_in_polygon(p, polygon):
+    """
+    Test przynależności punktu do wielokąta (ray casting).
+    Punkt leżący na brzegu traktujemy jako należący do wielokąta.
+    """
+    px, py = p
+    inside = False
+    n = len(polygon)
+    for i in range(n):
+        a, b = polygon[i], polygon[(i + 1) % n]
+        if on_segment(p, a, b): return True
+        # Czy półprosta w prawo od p przecina krawędź ab?
+        if (a[1] > py) != (b[1] > py):
+            x_cross = a[0] + (py - a[1]) * (b[0] - a[0]) / (b[1] - a[1])
+            if x_cross > px:
+                inside = not inside
+    return inside
+
 # Helpery dla GUI
 def get_line_equation(p1, p2):
     x1, y1 = p1
@@ -0,0 +1,162 @@
+import heapq
+import math
+from .math_utils import distance_point_to_segment
+from .kernels import get_kernel
+
+try:
+    import numpy as np
+except ImportError: # NumPy jest potrzebny tylko dla zapytań wsadowych
+    np = None
+
+# --- INDEKS NAJBLIŻSZYCH ODCINKÓW ---
+
+def _bbox_distance(p, bbox):
+    """Odległość punktu od prostokąta ograniczającego (0, jeśli punkt jest w środku)."""
+    x_min, y_min, x_max, y_max = bbox
+    dx = max(x_min - p[0], 0, p[0] - x_max)
+    dy = max(y_min - p[1], 0, p[1] - y_max)
+    return math.hypot(dx, dy)
+
+def _merge_bboxes(bboxes):
+    return (min(b[0] for b in bboxes), min(b[1] for b in bboxes),
+            max(b[2] for b in bboxes), max(b[3] for b in bboxes))
+
+class SegmentIndex:
+    """
+    Statyczne drzewo prostokątów ograniczających (packed R-tree) nad odcinkami.
+
+    Odcinki są porządkowane metodą STR (pasy po X, w pasie sortowanie po Y)
+    i pakowane po `leaf_size` do liści; wyższe poziomy grupują po `fanout`
+    kolejnych węzłów. Poziom l to lista (bbox, c0, c1), gdzie [c0, c1) to
+    zakres dzieci na poziomie l-1 (dla liści - zakres w tablicy `order`).
+
+    Zapytania przeglądają drzewo "najpierw najlepszy" (kopiec po odległości
+    od prostokąta), a dokładną odległość liczy `distance_point_to_segment`.
+    """
+    def __init__(self, segments, leaf_size=16, fanout=16):
+        self.segments = [(tuple(a), tuple(b)) for a, b in segments]
+        self.levels = []
+        self._arrays = None # Tablice NumPy dla zapytań wsadowych (tworzone leniwie)
+        if not self.segments: return
+
+        # 1. Porządek STR
+        centers = [((a[0] + b[0]) / 2, (a[1] + b[1]) / 2) for a, b in self.segments]
+        by_x = sorted(range(len(self.segments)), key=lambda i: centers[i][0])
+        n_leaves = math.ceil(len(by_x) / leaf_size)
+        slice_len = math.ceil(math.sqrt(n_leaves)) * leaf_size
+        self.order = []
+        for s in range(0, len(by_x), slice_len):
+            self.order += sorted(by_x[s:s + slice_len], key=lambda i: centers[i][1])
+
+        # 2. Liście
+        leaves = []
+        for c0 in range(0, len(self.order), leaf_size):
+            c1 = min(c0 + leaf_size, len(self.order))
+            bbox = _merge_bboxes([self._segment_bbox(i) for i in self.order[c0:c1]])
+            leaves.append((bbox, c0, c1))
+        self.levels.append(leaves)
+
+        # 3. Wyższe poziomy aż do pojedynczego korzenia
+        while len(self.levels[-1]) > 1:
+            lower = self.levels[-1]
+            level = []
+            for c0 in range(0, len(lower), fanout):
+                c1 = min(c0 + fanout, len(lower))
+                level.append((_merge_bboxes([node[0] for node in lower[c0:c1]]), c0, c1))
+            self.levels.append(level)
+
+    def _segment_bbox(self, i):
+        a, b = self.segments[i]
+        return (min(a[0], b[0]), min(a[1], b[1]), max(a[0], b[0]), max(a[1], b[1]))
+
+    def k_nearest(self, p, k):
+        """
+        Zwraca k najbliższych odcinków jako listę (id, odległość), rosnąco.
+        Przeszukiwanie "najpierw najlepszy": węzeł jest rozwijany dopiero,
+        gdy jego prostokąt jest bliżej niż wszystko, co zostało w kopcu.
+        """
+        if not self.levels or k <= 0: return []
+        top = len(self.levels) - 1
+        # Wpisy kopca: (odległość, poziom, indeks); poziom -1 oznacza odcinek
+        heap = [(0.0, top, 0)]
+        result = []
+        while heap and len(result) < k:
+            dist, level, idx = heapq.heappop(heap)
+            if level == -1:
+                result.append((idx, dist))
+                continue
+            _, c0, c1 = self.levels[level][idx]
+            if level == 0:
+                for i in self.order[c0:c1]:
+                    a, b = self.segments[i]
+                    heapq.heappush(heap, (distance_point_to_segment(p, a, b), -1, i))
+            else:
+                for c in range(c0, c1):
+                    heapq.heappush(heap, (_bbox_distance(p, self.levels[level - 1][c][0]), level - 1, c))
+        return result
+
+    def nearest(self, p):
+        """Zwraca (id, odległość) najbliższego odcinka lub None dla pustego indeksu."""
+        res = self.k_nearest(p, 1)
+        return res[0] if res else None
+
+    # --- ZAPYTANIA WSADOWE (NumPy) ---
+
+    def _numpy_arrays(self):
+        if self._arrays is None:
+            self._arrays = (np.asarray(self.segments, dtype=float).reshape(-1, 4),
+                            np.asarray(self.order, dtype=np.intp),
+                            [np.asarray([node[0] for node in level], dtype=float) for level in self.levels])
+        return self._arrays
+
+    def nearest_many(self, points):
+        """
+        Najbliższy odcinek dla wielu punktów naraz.
+
+        Z NumPy drzewo jest przechodzone wspólnie dla całej grupy zapytań:
+        w każdym węźle odrzucamy wektorowo punkty, dla których prostokąt jest
+        dalej niż dotychczasowy najlepszy wynik, a odległości do odcinków
+        liścia liczy macierzowo `segment_distances` wybranego jądra.
+        Zwraca (ids, distances) - tablice NumPy (bez NumPy: listy z wynikami
+        `nearest`; id = -1 dla pustego indeksu).
+        """
+        if np is None:
+            found = [self.nearest(p) or (-1, math.inf) for p in points]
+            return [f[0] for f in found], [f[1] for f in found]
+
+        q = np.asarray(points, dtype=float).reshape(-1, 2)
+        best = np.full(len(q), np.inf)
+        best_id = np.full(len(q), -1, dtype=np.intp)
+        if not self.levels: return best_id, best
+
+        segs, order, bboxes = self._numpy_arrays()
+        kernel = get_kernel()
+        stack = [(len(self.levels) - 1, 0, np.arange(len(q)))]
+        while stack:
+            level, idx, qs = stack.pop()
+            # Filtr z aktualnym (być może już lepszym) ograniczeniem
+            qs = qs[_bbox_distances(q[qs], bboxes[level][idx:idx + 1])[:, 0] < best[qs]]
+            if len(qs) == 0: continue
+
+            _, c0, c1 = self.levels[level][idx]
+            if level == 0:
+                ids = order[c0:c1]
+                d = kernel.segment_distances(q[qs], segs[ids])
+                j = np.argmin(d, axis=1)
+                d_min = d[np.arange(len(qs)), j]
+                better = d_min < best[qs]
+                best[qs[better]] = d_min[better]
+                best_id[qs[better]] = ids[j[better]]
+            else:
+                d = _bbox_distances(q[qs], bboxes[level - 1][c0:c1])
+                # Najbliższe dzieci na szczycie stosu (odwiedzane jako pierwsze)
+                for c in np.argsort(d.mean(axis=0))[::-1]:
+                    sel = qs[d[:, c] < best[qs]]
+                    if len(sel): stack.append((level - 1, c0 + int(c), sel))
+        return best_id, best
+
+def _bbox_distances(q, bboxes):
+    """Macierz (len(q), len(bboxes)) odległości punktów od prostokątów."""
+    dx = np.maximum(np.maximum(bboxes[None, :, 0] - q[:, None, 0], 0), q[:, None, 0] - bboxes[None, :, 2])
+    dy = np.maximum(np.maximum(bboxes[None, :, 1] - q[:, None, 1], 0), q[:, None, 1] - bboxes[None, :, 3])
+    return np.hypot(dx, dy)
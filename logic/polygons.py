@@ -0,0 +1,96 @@
+from .algorithm import run_sweep_line_algorithm, has_intersection
+from .math_utils import det, on_segment, point_in_polygon
+
+# --- ŁAMANE I WIELOKĄTY ---
+
+def polygon_edges(points, closed=True):
+    """
+    Zamienia listę wierzchołków na listę krawędzi [(a, b), ...].
+    Dla wielokąta (closed=True) dodaje krawędź zamykającą, chyba że
+    pierwszy wierzchołek jest już powtórzony na końcu listy.
+    """
+    points = list(points)
+    if closed and len(points) > 1 and tuple(points[0]) == tuple(points[-1]):
+        points = points[:-1]
+    edges = list(zip(points, points[1:]))
+    if closed and len(points) > 2:
+        edges.append((points[-1], points[0]))
+    return edges
+
+def _edges_overlap(e1, e2):
+    """Krawędzie leżą na jednej prostej i mają więcej niż jeden punkt wspólny."""
+    (a, b), (c, d) = e1, e2
+    if abs(det(a, b, c)) > 1e-9 or abs(det(a, b, d)) > 1e-9:
+        return False
+    common = {tuple(p) for p in (a, b) if on_segment(p, c, d)} | \
+             {tuple(p) for p in (c, d) if on_segment(p, a, b)}
+    return len(common) >= 2
+
+def _adjacent_edges(edges, closed):
+    """
+    Predykat dla `ignore_pair`: krawędzie i oraz j są sąsiednie w łamanej
+    (dzielą wierzchołek), więc ich styk nie jest przecięciem. Wyjątkiem jest
+    łamana zawracająca po tej samej prostej - sąsiednie krawędzie nakładają
+    się wtedy na odcinku, a nie tylko we wspólnym wierzchołku.
+    """
+    n = len(edges)
+    def ignore(i, j):
+        d = abs(i - j)
+        if not (d == 1 or (closed and d == n - 1)): return False
+        return not _edges_overlap(edges[i], edges[j])
+    return ignore
+
+def polyline_intersections(points, closed=False):
+    """
+    Zwraca punkty samoprzecięcia łamanej (lub wielokąta dla closed=True).
+    Styki sąsiednich krawędzi we wspólnym wierzchołku są pomijane
+    już w trakcie zamiatania - nie trafiają do kolejki zdarzeń.
+    Krawędzie nakładające się na siebie zgłaszamy końcami części wspólnej.
+    """
+    edges = polygon_edges(points, closed)
+    overlaps = []
+    result = run_sweep_line_algorithm(edges, ignore_pair=_adjacent_edges(edges, closed), overlaps=overlaps)
+    known = {(round(x, 9), round(y, 9)) for x, y in result}
+    for _, _, common in overlaps:
+        for x, y in common:
+            if (round(x, 9), round(y, 9)) not in known:
+                known.add((round(x, 9), round(y, 9)))
+                result.append((x, y))
+    return result
+
+def is_simple(polygon):
+    """
+    Sprawdza, czy wielokąt jest prosty (brzeg nie przecina sam siebie).
+    Korzysta z trybu Shamosa-Hoeya - kończy przy pierwszym przecięciu.
+    """
+    edges = polygon_edges(polygon, closed=True)
+    return not has_intersection(edges, ignore_pair=_adjacent_edges(edges, True))
+
+def _bounding_box(points):
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def polygons_intersect(a, b):
+    """
+    Sprawdza, czy dwa wielokąty proste mają część wspólną
+    (przecinające się brzegi lub zawieranie jednego w drugim).
+
+    1. Szybkie odrzucenie po prostokątach ograniczających.
+    2. Zamiatanie w trybie Shamosa-Hoeya, w którym porównujemy tylko
+       krawędzie różnych wielokątów.
+    3. Brak przecięć brzegów - wystarczy sprawdzić zawieranie jednego wierzchołka.
+    """
+    ax1, ay1, ax2, ay2 = _bounding_box(a)
+    bx1, by1, bx2, by2 = _bounding_box(b)
+    if ax2 < bx1 - 1e-9 or bx2 < ax1 - 1e-9 or ay2 < by1 - 1e-9 or by2 < ay1 - 1e-9:
+        return False
+
+    edges_a = polygon_edges(a, closed=True)
+    edges_b = polygon_edges(b, closed=True)
+    na = len(edges_a)
+    same_polygon = lambda i, j: (i < na) == (j < na)
+    if has_intersection(edges_a + edges_b, ignore_pair=same_polygon):
+        return True
+
+    return point_in_polygon(a[0], b) or point_in_polygon(b[0], a)
@@ -46,15 +46,16 @@ class Event:
     Zdarzenie w kolejce priorytetowej algorytmu.
     """
     INTERSECTION = 0  # Przecięcie (najwyższy priorytet przy tym samym X)
-    END = 1           # Koniec odcinka
-    START = 2         # Początek odcinka
+    VERTICAL = 1      # Odcinek pionowy (cały w jednym X, nie trafia do statusu)
+    END = 2           # Koniec odcinka
+    START = 3         # Początek odcinka
 
     def __init__(self, x, point, type, segments):
         self.x = x
         self.point = point
         self.type = type
         # Lista segmentów, których dotyczy zdarzenie.
-        # Dla START/END to jeden segment. Dla INTERSECTION to dwa przecinające się segmenty.
+        # Dla START/END/VERTICAL to jeden segment. Dla INTERSECTION to dwa przecinające się segmenty.
         self.segments = segments 
 
     def __lt__(self, other):
@@ -63,6 +64,7 @@ class Event:
         1. X: Mniejsze X wcześniej (miotła idzie w prawo).
         2. Typ: Przy tym samym X:
            - Najpierw obsługujemy PRZECIĘCIA (aby zamienić kolejność odcinków).
+           - Potem odcinki PIONOWE (póki kończące się odcinki są jeszcze w statusie).
            - Potem KOŃCE (aby usunąć stare).
            - Na końcu POCZĄTKI (aby dodać nowe).
         3. Y: Od dołu do góry.
@@ -1,4 +1,5 @@
 import unittest
+import random
 import sys
 import os
 
@@ -10,8 +11,19 @@ parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
 sys.path.append(parent_dir)
 
 # --- IMPORTY Z MODUŁÓW APLIKACJI ---
-from logic.algorithm import find_intersection
-from logic.math_utils import on_segment, distance_point_to_segment
+from logic.algorithm import find_intersection, run_sweep_line_algorithm, count_intersections, has_intersection, ToleranceGrid
+from logic.arrangement import build_arrangement
+from logic.polygons import is_simple, polygons_intersect, polyline_intersections
+from logic.math_utils import det, on_segment, distance_point_to_segment, get_intersection_math, slope, y_at_x
+from logic.primitives import Point, Segment
+from logic.lines import line_arrangement
+from logic.nearest import SegmentIndex
+from logic.kernels import available_kernels, get_kernel, set_kernel
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class TestGeometryLogic(unittest.TestCase):
 
@@ -102,6 +114,272 @@ class TestGeometryLogic(unittest.TestCase):
         res_type, res_data = find_intersection((0, 0), (1, 1), (2, 2), (3, 3))
         self.assertEqual(res_type, "NONE")
 
+    def test_partial_results_callback(self):
+        """Test 8: Wyniki częściowe są przekazywane w trakcie zamiatania."""
+        # Trzy odcinki: poziomy przecinany przez dwa ukośne
+        segments = [((0, 0), (10, 0)), ((2, -1), (3, 1)), ((7, -1), (8, 1))]
+        streamed = []
+        results = run_sweep_line_algorithm(segments, on_point=streamed.append)
+
+        self.assertEqual(streamed, results)
+        self.assertEqual(len(results), 2)
+        self.assertPointEqual(results[0], (2.5, 0))
+        self.assertPointEqual(results[1], (7.5, 0))
+
+    def test_neighbors_after_end(self):
+        """Po końcu środkowego odcinka jego sąsiedzi stają się sąsiadami i się przecinają."""
+        segments = [((0, -2), (10, 2)), ((0, 0), (1, 0)), ((0, 2), (10, -2))]
+        results = run_sweep_line_algorithm(segments)
+        self.assertEqual(len(results), 1)
+        self.assertPointEqual(results[0], (5, 0))
+
+    def test_shared_start_keeps_order(self):
+        """Odcinki wychodzące ze wspólnego punktu nie zamieniają się miejscami przy styku."""
+        shallow, steep, crossing = ((0, 0), (10, 1)), ((0, 0), (10, 10)), ((5, -1), (6, 2))
+        for segments in ([shallow, steep, crossing], [steep, shallow, crossing]):
+            results = run_sweep_line_algorithm(segments)
+            self.assertTrue(any(abs(p[0] - 160 / 29) < 1e-7 and abs(p[1] - 16 / 29) < 1e-7 for p in results),
+                            msg=f"{segments}: {results}")
+
+    def test_vertical_segments_in_sweep(self):
+        """Pionowe odcinki w zamiataniu N odcinków."""
+        res = run_sweep_line_algorithm([((0, 0), (10, 0)), ((2, -1), (2, 1)), ((7, -1), (7, 1))])
+        self.assertEqual(len(res), 2)
+        self.assertPointEqual(res[0], (2, 0))
+        self.assertPointEqual(res[1], (7, 0))
+
+    def test_triple_point_order(self):
+        """Trzy odcinki przez (5, 0): cały blok zmienia kolejność, dalsze przecięcia nie giną."""
+        segments = [((0, -5), (10, 5)), ((0, 5), (10, -5)), ((0, 0), (10, 0)), ((7, -4), (9, 4))]
+        results = sorted(run_sweep_line_algorithm(segments))
+        self.assertEqual(len(results), 4)
+        for p, q in zip(results, [(5, 0), (7.4, -2.4), (8, 0), (9, 4)]):
+            self.assertPointEqual(p, q)
+
+    def test_end_meets_start(self):
+        """Odcinek zaczynający się tam, gdzie skończył się inny, daje punkt styku."""
+        results = run_sweep_line_algorithm([((0, 0), (2, 1)), ((2, 1), (4, 0))])
+        self.assertEqual(len(results), 1)
+        self.assertPointEqual(results[0], (2, 1))
+
+    def test_count_and_any_modes(self):
+        """Test 9: Tryby bez materializacji punktów (liczba / czy istnieje)."""
+        crossing = [((0, 0), (10, 0)), ((2, -1), (3, 1)), ((7, -1), (8, 1))]
+        disjoint = [((0, 0), (1, 1)), ((2, 0), (3, 1)), ((0, 5), (3, 5))]
+
+        self.assertEqual(count_intersections(crossing), 2)
+        self.assertEqual(count_intersections(disjoint), 0)
+        self.assertTrue(has_intersection(crossing))
+        self.assertFalse(has_intersection(disjoint))
+
+    def test_tolerance_dedup(self):
+        """Test 10: Punkty równe w granicach 1e-9 to jedno przecięcie."""
+        grid = ToleranceGrid(1e-9)
+        grid.add((0.2857142857142856, 0.2857142857142858))
+        self.assertIn((0.2857142857142857, 0.2857142857142856), grid)
+        self.assertNotIn((0.2857143, 0.2857142857142858), grid)
+
+        # Miotła minęła punkt - wpis zostaje zwolniony
+        grid.prune(1.0)
+        self.assertEqual(len(grid), 0)
+
+        # Trzy odcinki przez (1/3, 1/7): każda para daje ten punkt z innym błędem
+        # zaokrąglenia. Bez tolerancji powstawały trzy zdarzenia zamiast jednego.
+        p = (1 / 3, 1 / 7)
+        segments = [((p[0] - dx / 3, p[1] - dy / 3), (p[0] + dx / 2, p[1] + dy / 2))
+                    for dx, dy in ((1, 2), (2, -1), (2, 5))]
+        results = run_sweep_line_algorithm(segments)
+        self.assertEqual(len(results), 1)
+        self.assertPointEqual(results[0], p)
+
+        # Dalsze przecięcia za punktem potrójnym nie mogą zginąć ani się zdublować
+        results = run_sweep_line_algorithm(segments + [((p[0] + 0.4, -5), (p[0] + 0.45, 5))])
+        self.assertEqual(len(results), 4)
+
+    def test_grid_of_crossings(self):
+        """Test 11: Kratka z czterech odcinków - cztery przecięcia."""
+        segments = [((0, 1), (5, 1.2)), ((0, 3), (5, 3.3)), ((1, 0), (1.3, 5)), ((3, 0), (3.4, 5))]
+        self.assertEqual(len(run_sweep_line_algorithm(segments)), 4)
+
+    def test_collinear_overlaps_in_sweep(self):
+        """Test 12: Nakładające się odcinki współliniowe wykrywane w trakcie zamiatania."""
+        segments = [((0, 0), (4, 0)), ((2, 0), (6, 0)), ((6, 0), (7, 0)),  # Pozioma prosta
+                    ((0, 0), (4, 4)), ((5, 5), (3, 3)),                     # Ukośna, odwrócony kierunek
+                    ((1, -1), (1, 5)), ((1, 2), (1, 3))]                    # Pionowa
+        overlaps = []
+        run_sweep_line_algorithm(segments, overlaps=overlaps)
+        found = {(a, b): common for a, b, common in overlaps}
+
+        self.assertEqual(set(found), {(0, 1), (3, 4), (5, 6)}) # Styk (1, 2) w jednym punkcie to nie nakładanie
+        self.assertPointEqual(found[(0, 1)][0], (2, 0))
+        self.assertPointEqual(found[(0, 1)][1], (4, 0))
+        self.assertPointEqual(found[(3, 4)][0], (3, 3))
+        self.assertPointEqual(found[(3, 4)][1], (4, 4))
+        self.assertPointEqual(found[(5, 6)][0], (1, 2))
+        self.assertPointEqual(found[(5, 6)][1], (1, 3))
+
+        self.assertTrue(has_intersection([((0, 0), (4, 0)), ((2, 0), (6, 0))]))
+
+    def test_collinear_overlaps_off_axis(self):
+        """Nakładanie na ukośnych prostych o niecałkowitych współrzędnych (granice zaokrąglenia klucza)."""
+        a = ((-693.4989672151926, 826.9397680681786), (-698.8418026688671, 835.4035946323224))
+        b = ((-698.3790260729949, 834.6704893590328), (-699.1262848945543, 835.8542557540574))
+        self.assertEqual(find_intersection(*a, *b)[0], "SEGMENT")
+        overlaps = []
+        run_sweep_line_algorithm([a, b], overlaps=overlaps)
+        self.assertEqual(len(overlaps), 1)
+        self.assertTrue(has_intersection([a, b]))
+
+        rng = random.Random(11)
+        for _ in range(300):
+            x0, y0 = rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3)
+            dx, dy = rng.uniform(-10, 10), rng.uniform(-10, 10)
+            t = [rng.uniform(0, 1) for _ in range(4)]
+            p = [(x0 + ti * dx, y0 + ti * dy) for ti in t]
+            a, b = (p[0], p[1]), (p[2], p[3])
+            if find_intersection(*a, *b)[0] != "SEGMENT": continue
+            overlaps = []
+            run_sweep_line_algorithm([a, b], overlaps=overlaps)
+            self.assertEqual(len(overlaps), 1, msg=f"{a} {b}")
+            self.assertTrue(has_intersection([a, b]), msg=f"{a} {b}")
+
+    # --- TESTY ARANŻACJI (DCEL) ---
+
+    def test_arrangement_cross(self):
+        """Dwa przecinające się odcinki: 5 wierzchołków, 4 krawędzie, 1 ściana."""
+        arr = build_arrangement([((-2, -2), (2, 2)), ((-2, 2), (2, -2))])
+
+        self.assertEqual(len(arr.vertices), 5)
+        self.assertEqual(len(arr.edges()), 4)
+        self.assertEqual(len(arr.faces), 1)
+        self.assertPointEqual(arr.splits[0][0], (0, 0))
+        self.assertPointEqual(arr.splits[1][0], (0, 0))
+
+    def test_arrangement_triangle_faces(self):
+        """Trójkąt: ściana wewnętrzna i zewnętrzna, bliźniaki po przeciwnych stronach."""
+        arr = build_arrangement([((0, 0), (4, 1)), ((4, 1), (1, 4)), ((1, 4), (0, 0))])
+
+        self.assertEqual(len(arr.vertices), 3)
+        self.assertEqual(len(arr.edges()), 3)
+        self.assertEqual(len(arr.faces), 2)
+        for f in range(len(arr.faces)):
+            self.assertEqual(len(arr.face_boundary(f)), 3)
+        for e in range(len(arr.he_origin)):
+            self.assertNotEqual(arr.he_face[e], arr.he_face[arr.twin(e)])
+
+    def test_arrangement_vertical_through_crossing(self):
+        """Pionowy odcinek przez punkt przecięcia dwóch innych jest w nim dzielony."""
+        arr = build_arrangement([((0, 0), (0, 4)), ((-1, 1), (1, 3)), ((-1, 3), (1, 1))])
+
+        self.assertEqual(len(arr.vertices), 7)
+        self.assertEqual(len(arr.edges()), 6)
+        self.assertEqual(len(arr.faces), 1)
+        self.assertEqual(len(arr.splits[0]), 1)
+        self.assertPointEqual(arr.splits[0][0], (0, 2))
+
+    def test_arrangement_vertical_t_junctions(self):
+        """Punkty podziału pionowego odcinka są uporządkowane według Y, krawędzie się nie nakładają."""
+        arr = build_arrangement([((0, 0), (0, 4)), ((-1, 3), (1, 3)), ((0, 1), (2, 2))])
+
+        self.assertEqual([p[1] for p in arr.splits[0]], [1, 3])
+        vertical_edges = sorted(sorted((arr.vertices[u][1], arr.vertices[v][1]))
+                                for k, (u, v) in enumerate(arr.edges()) if arr.he_segment[2 * k] == 0)
+        self.assertEqual(vertical_edges, [[0, 1], [1, 3], [3, 4]])
+        self.assertEqual(len(arr.vertices) - len(arr.edges()) + len(arr.faces), 2)
+
+    # --- TESTY WIELOKĄTÓW I ŁAMANYCH ---
+
+    def test_polygon_is_simple(self):
+        """Wspólne wierzchołki sąsiednich krawędzi nie są przecięciami."""
+        square = [(0, 0), (4, 0), (4, 4), (0, 4)]
+        bowtie = [(0, 0), (4, 4), (4, 0), (0, 4)]
+
+        self.assertTrue(is_simple(square))
+        self.assertEqual(polyline_intersections(square, closed=True), [])
+        self.assertFalse(is_simple(bowtie))
+        self.assertPointEqual(polyline_intersections(bowtie, closed=True)[0], (2, 2))
+
+    def test_polyline_self_intersection(self):
+        # Ostatnia krawędź przecina drugą: y = x - 1 oraz y = -x + 4
+        res = polyline_intersections([(0, 0), (2, 2), (4, 0), (4, 3), (1, 0)])
+        self.assertEqual(len(res), 1)
+        self.assertPointEqual(res[0], (2.5, 1.5))
+
+    def test_adjacent_edges_folding_back(self):
+        """Sąsiednie krawędzie zawracające po tej samej prostej nakładają się, a nie tylko stykają."""
+        self.assertFalse(is_simple([(0, 0), (2, 0), (1, 0)]))
+        res = polyline_intersections([(0, 0), (4, 0), (2, 0)])
+        self.assertEqual(sorted(res), [(2, 0), (4, 0)])
+        # Przedłużenie w tym samym kierunku to zwykły wierzchołek
+        self.assertEqual(polyline_intersections([(0, 0), (2, 0), (4, 0)]), [])
+
+    def test_polygons_intersect(self):
+        square = [(0, 0), (4, 0), (4, 4), (0, 4)]
+        self.assertTrue(polygons_intersect(square, [(3, 3), (6, 3), (6, 6)]))   # Przecięcie brzegów
+        self.assertTrue(polygons_intersect(square, [(1, 1), (2, 1), (2, 2)]))   # Zawieranie
+        self.assertFalse(polygons_intersect(square, [(5, 5), (6, 5), (6, 6)]))  # Rozłączne prostokąty
+        self.assertFalse(polygons_intersect(square, [(4.5, 0), (6, 0), (6, 6)]))
+
+    # --- TESTY WSADOWYCH PRZECIĘĆ PROSTYCH ---
+
+    @unittest.skipIf(np is None, "Wymaga NumPy")
+    def test_line_arrangement_matches_pairwise(self):
+        """Wynik blokowy (małe bloki) zgodny z get_intersection_math dla każdej pary."""
+        lines = [((0, 0), (1, 1)), ((0, 2), (1, 2)), ((3, 0), (3, 1)),
+                 ((0, 1), (1, 2)), ((-1, 4), (2, -2)), ((5, 5), (6, 5))]
+        pairs, points = line_arrangement(lines, chunk_size=4)
+
+        expected = {}
+        for i in range(len(lines)):
+            for j in range(i + 1, len(lines)):
+                pt = get_intersection_math(*lines[i], *lines[j])
+                if pt: expected[(i, j)] = pt
+
+        self.assertEqual(sorted(map(tuple, pairs.tolist())), sorted(expected))
+        for (i, j), pt in zip(pairs.tolist(), points.tolist()):
+            self.assertPointEqual(pt, expected[(i, j)])
+
+    @unittest.skipIf(np is None, "Wymaga NumPy")
+    def test_line_arrangement_bbox(self):
+        lines = [((0, 0), (1, 1)), ((0, 2), (1, 2)), ((0, 10), (1, 10))]
+        pairs, points = line_arrangement(lines, bbox=(0, 0, 5, 5))
+        self.assertEqual(pairs.tolist(), [[0, 1]])
+        self.assertPointEqual(points[0], (2, 2))
+
+    # --- TESTY INDEKSU NAJBLIŻSZYCH ODCINKÓW ---
+
+    def _random_segments(self, n, seed):
+        rng = random.Random(seed)
+        segments = []
+        for _ in range(n):
+            x, y = rng.uniform(0, 100), rng.uniform(0, 100)
+            segments.append(((x, y), (x + rng.uniform(-5, 5), y + rng.uniform(-5, 5))))
+        return segments
+
+    def test_k_nearest_matches_brute_force(self):
+        segments = self._random_segments(300, seed=1)
+        index = SegmentIndex(segments, leaf_size=8, fanout=4)
+        rng = random.Random(2)
+        for _ in range(50):
+            p = (rng.uniform(-10, 110), rng.uniform(-10, 110))
+            brute = sorted(distance_point_to_segment(p, a, b) for a, b in segments)[:5]
+            found = index.k_nearest(p, 5)
+            for (seg_id, dist), expected in zip(found, brute):
+                self.assertAlmostEqual(dist, expected)
+                self.assertAlmostEqual(dist, distance_point_to_segment(p, *segments[seg_id]))
+
+        self.assertIsNone(SegmentIndex([]).nearest((0, 0)))
+
+    def test_nearest_many(self):
+        segments = self._random_segments(300, seed=3)
+        index = SegmentIndex(segments, leaf_size=8, fanout=4)
+        rng = random.Random(4)
+        points = [(rng.uniform(-10, 110), rng.uniform(-10, 110)) for _ in range(100)]
+        ids, dists = index.nearest_many(points)
+        for p, seg_id, dist in zip(points, list(ids), list(dists)):
+            self.assertAlmostEqual(dist, min(distance_point_to_segment(p, a, b) for a, b in segments))
+            self.assertAlmostEqual(dist, distance_point_to_segment(p, *segments[seg_id]))
+
     # --- TESTY MATH UTILS (Funkcje pomocnicze) ---
 
     def test_on_segment(self):
@@ -120,5 +398,76 @@ class TestGeometryLogic(unittest.TestCase):
         dist = distance_point_to_segment((1, 1), (0, 0), (2, 0))
         self.assertAlmostEqual(dist, 1.0)
 
+# --- RÓWNOWAŻNOŚĆ JĄDER (BACKENDÓW) ---
+# Wszystkie powyższe przypadki uruchamiamy ponownie dla każdego jądra.
+
+class KernelTestMixin:
+    KERNEL = None
+
+    def setUp(self):
+        if self.KERNEL not in available_kernels():
+            self.skipTest(f"Jądro {self.KERNEL} niedostępne")
+        self._previous_kernel = get_kernel().name
+        set_kernel(self.KERNEL)
+
+    def tearDown(self):
+        set_kernel(self._previous_kernel)
+
+class TestGeometryLogicPythonKernel(KernelTestMixin, TestGeometryLogic):
+    KERNEL = "python"
+
+class TestGeometryLogicNumpyKernel(KernelTestMixin, TestGeometryLogic):
+    KERNEL = "numpy"
+
+class TestGeometryLogicNumbaKernel(KernelTestMixin, TestGeometryLogic):
+    KERNEL = "numba"
+
+class TestKernelEquivalence(unittest.TestCase):
+
+    @unittest.skipIf(np is None, "Wymaga NumPy")
+    def test_batch_primitives_match_reference(self):
+        """Prymitywy wsadowe każdego jądra dają to samo co referencyjne pętle w Pythonie."""
+        rng = random.Random(5)
+        lines = np.array([[rng.uniform(-10, 10) for _ in range(4)] for _ in range(40)])
+        lines[3] = lines[4] + [1, 1, 1, 1] # Para równoległa
+        points = np.array([[rng.uniform(-10, 10) for _ in range(2)] for _ in range(15)])
+
+        previous = get_kernel().name
+        reference = set_kernel("python")
+        ref_lines = reference.line_intersections_block(lines[:20], lines[20:])
+        ref_dist = reference.segment_distances(points, lines)
+        try:
+            for name in available_kernels():
+                kernel = set_kernel(name)
+                ii, jj, x, y = kernel.line_intersections_block(lines[:20], lines[20:])
+                self.assertEqual(ii.tolist(), ref_lines[0].tolist(), msg=name)
+                self.assertEqual(jj.tolist(), ref_lines[1].tolist(), msg=name)
+                np.testing.assert_allclose(x, ref_lines[2], rtol=1e-9, atol=1e-9)
+                np.testing.assert_allclose(y, ref_lines[3], rtol=1e-9, atol=1e-9)
+                np.testing.assert_allclose(kernel.segment_distances(points, lines), ref_dist, rtol=1e-9, atol=1e-9)
+        finally:
+            set_kernel(previous)
+
+    def test_scalar_predicates_match_reference(self):
+        """Predykaty skalarne (w tym slope i cross używane przez status miotły) zgodne z math_utils."""
+        segments = [Segment(Point(0, 0), Point(4, 2), 0), Segment(Point(1, -1), Point(1, 3), 1),
+                    Segment(Point(-2, 5), Point(3, 5), 2)]
+        previous = get_kernel().name
+        try:
+            for name in available_kernels():
+                kernel = set_kernel(name)
+                for seg in segments:
+                    self.assertEqual(kernel.slope(seg), slope(seg), msg=name)
+                    self.assertAlmostEqual(kernel.y_at_x(seg, 1.5), y_at_x(seg, 1.5), msg=name)
+                self.assertAlmostEqual(kernel.cross((4, 2), (2, 1)), 0.0, msg=name)
+                self.assertAlmostEqual(kernel.cross((1, 0), (0, 1)), 1.0, msg=name)
+                self.assertAlmostEqual(kernel.det((0, 0), (1, 0), (0, 1)), det((0, 0), (1, 0), (0, 1)), msg=name)
+        finally:
+            set_kernel(previous)
+
+    def test_unknown_kernel(self):
+        with self.assertRaises(ValueError):
+            set_kernel("fortran")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
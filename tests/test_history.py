@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+
+# --- KONFIGURACJA ŚCIEŻKI ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from gui.history import DeltaHistory
+
+class TestDeltaHistory(unittest.TestCase):
+
+    def test_records_only_changed_coordinates(self):
+        history = DeltaHistory()
+        history.reset([0, 0, 4, 4, 0, 4, 4, 0])
+        self.assertTrue(history.record([0, 0, 5, 6, 0, 4, 4, 0]))
+        self.assertFalse(history.record([0, 0, 5, 6, 0, 4, 4, 0])) # Brak zmian
+
+        self.assertEqual(history.undo_stack[-1], ((2, 4, 5), (3, 4, 6)))
+        self.assertEqual(history.undo(), [(2, 4), (3, 4)])
+        self.assertEqual(history.redo(), [(2, 5), (3, 6)])
+        self.assertEqual(history.undo(), [(2, 4), (3, 4)])
+        self.assertEqual(history.undo(), [])
+
+    def test_new_change_clears_redo(self):
+        history = DeltaHistory()
+        history.reset([0, 0])
+        history.record([1, 0])
+        history.undo()
+        history.record([0, 2])
+        self.assertEqual(history.redo(), [])
+        self.assertEqual(history.cost, 1)
+
+    def test_memory_budget_evicts_oldest(self):
+        history = DeltaHistory(budget=4)
+        history.reset([0, 0])
+        for step in range(1, 6):
+            history.record([step, step]) # 2 współrzędne na krok
+        self.assertEqual(len(history.undo_stack), 2)
+        self.assertLessEqual(history.cost, 4)
+        self.assertEqual(history.undo(), [(0, 4), (1, 4)])
+
+if __name__ == '__main__':
+    unittest.main()
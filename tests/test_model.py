@@ -0,0 +1,31 @@
+import unittest
+import sys
+import os
+
+# --- KONFIGURACJA ŚCIEŻKI ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from gui.model import GeometryModel
+
+class TestGeometryModel(unittest.TestCase):
+
+    def test_valid_edit_updates_values(self):
+        model = GeometryModel(['x1', 'y1'], [0, 0])
+        self.assertTrue(model.set_text('y1', '2,5'))
+        self.assertEqual(list(model.coords()), [0.0, 2.5])
+        self.assertEqual(model.get('y1'), 2.5)
+
+    def test_invalid_edit_keeps_last_value(self):
+        model = GeometryModel(['x1', 'y1'], [1, 1])
+        self.assertFalse(model.set_text('x1', '1.2.3'))
+        self.assertIsNone(model.coords())
+        self.assertEqual(model.get('x1'), 1.0)
+
+        # Poprawny wpis (lub ustawienie z myszki) przywraca model
+        model.set('x1', 3)
+        self.assertEqual(list(model.coords()), [3.0, 1.0])
+
+if __name__ == '__main__':
+    unittest.main()
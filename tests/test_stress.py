@@ -0,0 +1,295 @@
+import unittest
+import math
+import random
+import sys
+import os
+import time
+
+# --- KONFIGURACJA ŚCIEŻKI ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from logic.algorithm import run_sweep_line_algorithm, count_intersections, has_intersection
+from logic.math_utils import det, on_segment, get_intersection_math
+from logic.kinetic import KineticIntersections
+from logic.arrangement import build_arrangement
+
+# --- GENERATORY ODCINKÓW (deterministyczne - zawsze z podanym ziarnem) ---
+
+def random_segments(rng, n, size=100):
+    """Odcinki w położeniu ogólnym."""
+    return [((rng.uniform(0, size), rng.uniform(0, size)), (rng.uniform(0, size), rng.uniform(0, size)))
+            for _ in range(n)]
+
+def shared_endpoint_segments(rng, n):
+    """
+    Odcinki między punktami małej siatki - wiele wspólnych końców i styków.
+    Punkty są bez powtórzeń, a liczba odcinków ograniczona liczbą różnych par
+    (inaczej pętla losowania mogłaby się nie skończyć).
+    """
+    points = list(dict.fromkeys((float(rng.randint(0, 20)), float(rng.randint(0, 20)))
+                                for _ in range(n // 2 + 2)))
+    n = min(n, len(points) * (len(points) - 1) // 2)
+    segments, used = [], set()
+    while len(segments) < n:
+        a, b = rng.sample(points, 2)
+        if (a, b) in used or (b, a) in used: continue
+        used.add((a, b))
+        segments.append((a, b))
+    return segments
+
+def vertical_segments(rng, n):
+    """Połowa odcinków pionowych."""
+    segments = random_segments(rng, n // 2)
+    for _ in range(n - n // 2):
+        x = rng.uniform(0, 100)
+        segments.append(((x, rng.uniform(0, 100)), (x, rng.uniform(0, 100))))
+    return segments
+
+def horizontal_segments(rng, n):
+    """Połowa odcinków poziomych."""
+    segments = random_segments(rng, n // 2)
+    for _ in range(n - n // 2):
+        y = rng.uniform(0, 100)
+        segments.append(((rng.uniform(0, 100), y), (rng.uniform(0, 100), y)))
+    return segments
+
+def triple_point_segments(rng, n):
+    """Trójki odcinków przechodzących przez wspólny punkt."""
+    segments = []
+    for _ in range(n // 3):
+        cx, cy = rng.uniform(10, 90), rng.uniform(10, 90)
+        for _ in range(3):
+            angle = rng.uniform(0, math.pi)
+            r1, r2 = rng.uniform(1, 10), rng.uniform(1, 10)
+            segments.append(((cx - r1 * math.cos(angle), cy - r1 * math.sin(angle)),
+                             (cx + r2 * math.cos(angle), cy + r2 * math.sin(angle))))
+    return segments
+
+def mixed_segments(rng, n):
+    segments = []
+    for generator in (random_segments, shared_endpoint_segments, vertical_segments,
+                      horizontal_segments, triple_point_segments):
+        segments += generator(rng, n // 5)
+    return segments
+
+def short_segments(rng, n):
+    """Krótkie odcinki na obszarze rosnącym z n - liczba przecięć k rośnie liniowo z n."""
+    side = math.sqrt(n) * 20
+    segments = []
+    for _ in range(n):
+        x, y = rng.uniform(0, side), rng.uniform(0, side)
+        segments.append(((x, y), (x + rng.uniform(-10, 10), y + rng.uniform(-10, 10))))
+    return segments
+
+GENERATORS = [random_segments, shared_endpoint_segments, vertical_segments,
+              horizontal_segments, triple_point_segments, mixed_segments]
+
+# --- WYROCZNIA O(n^2) ---
+
+def brute_force(segments):
+    """
+    Sprawdza każdą parę niezależnie od miotły.
+    Zwraca (punkty przecięć par niewspółliniowych, czy_istnieje_jakiekolwiek_przecięcie).
+    Nakładanie się odcinków współliniowych liczy się tylko do drugiej wartości.
+    """
+    points, any_hit = [], False
+    for i in range(len(segments)):
+        p1, p2 = segments[i]
+        for j in range(i + 1, len(segments)):
+            p3, p4 = segments[j]
+            pt = get_intersection_math(p1, p2, p3, p4)
+            if pt is None:
+                # Współliniowe i nakładające się (więcej niż jeden punkt wspólny)
+                if abs(det(p3, p4, p1)) < 1e-9:
+                    common = {p for p in (p1, p2) if on_segment(p, p3, p4)} | \
+                             {p for p in (p3, p4) if on_segment(p, p1, p2)}
+                    if len(common) >= 2: any_hit = True
+                continue
+            if on_segment(pt, p1, p2) and on_segment(pt, p3, p4):
+                points.append(pt)
+                any_hit = True
+    return points, any_hit
+
+def unique_points(points, tol=1e-7):
+    result = []
+    for p in sorted(points):
+        if not any(abs(p[0] - q[0]) < tol and abs(p[1] - q[1]) < tol for q in result):
+            result.append(p)
+    return result
+
+class TestSweepAgainstOracle(unittest.TestCase):
+
+    def check(self, segments, msg):
+        expected_points, expected_any = brute_force(segments)
+        expected = unique_points(expected_points)
+        found = run_sweep_line_algorithm(segments)
+
+        self.assertEqual(len(unique_points(found)), len(found), msg=f"{msg}: zdublowane punkty")
+        self.assertEqual(len(found), len(expected), msg=msg)
+        for q in expected:
+            self.assertTrue(any(abs(p[0] - q[0]) < 1e-6 and abs(p[1] - q[1]) < 1e-6 for p in found),
+                            msg=f"{msg}: brak punktu {q}")
+        self.assertEqual(count_intersections(segments), len(expected), msg=msg)
+        self.assertEqual(has_intersection(segments), expected_any, msg=msg)
+
+    def test_small_inputs(self):
+        """Wiele małych przypadków - łatwe do odtworzenia po ziarnie."""
+        for generator in GENERATORS:
+            for seed in range(60):
+                segments = generator(random.Random(seed), 6)
+                self.check(segments, f"{generator.__name__} seed={seed}")
+
+    def test_medium_inputs(self):
+        for generator in GENERATORS:
+            for seed in range(8):
+                segments = generator(random.Random(seed), 60)
+                self.check(segments, f"{generator.__name__} seed={seed}")
+
+class TestArrangementEuler(unittest.TestCase):
+    """Graf aranżacji spełnia wzór Eulera: V - E + F = 2C (każdy składnik ma własną ścianę zewnętrzną)."""
+
+    def components(self, arr):
+        parent = list(range(len(arr.vertices)))
+        def find(v):
+            while parent[v] != v:
+                parent[v] = parent[parent[v]]
+                v = parent[v]
+            return v
+        for u, v in arr.edges():
+            parent[find(u)] = find(v)
+        return len({find(v) for v in range(len(arr.vertices))})
+
+    def test_euler_formula(self):
+        for generator in (shared_endpoint_segments, vertical_segments, horizontal_segments, mixed_segments):
+            for seed in range(60):
+                arr = build_arrangement(generator(random.Random(seed), 12))
+                V, E, F = len(arr.vertices), len(arr.edges()), len(arr.faces)
+                self.assertEqual(V - E + F, 2 * self.components(arr), msg=f"{generator.__name__} seed={seed}")
+
+    def test_euler_with_overlaps(self):
+        """Wspólny fragment odcinków współliniowych to jedna krawędź, a nie dwie nałożone."""
+        cases = [([((0, 0), (4, 0)), ((2, 0), (6, 0))], 4, 3),
+                 ([((0, 0), (4, 0)), ((2, 0), (6, 0)), ((3, -1), (3, 1))], 7, 6),
+                 ([((0, 0), (0, 4)), ((0, 2), (0, 6)), ((-1, 3), (1, 3))], 7, 6)]
+        for segments, expected_v, expected_e in cases:
+            arr = build_arrangement(segments)
+            V, E, F = len(arr.vertices), len(arr.edges()), len(arr.faces)
+            self.assertEqual((V, E), (expected_v, expected_e), msg=str(segments))
+            self.assertEqual(V - E + F, 2 * self.components(arr), msg=str(segments))
+
+class TestKineticAgainstOracle(unittest.TestCase):
+    """Tryb kinetyczny: po każdej klatce ruchu wynik ma być taki jak liczony od zera."""
+
+    def move_some(self, rng, segments, count, step=1.0):
+        segments = list(segments)
+        for i in rng.sample(range(len(segments)), count):
+            (x1, y1), (x2, y2) = segments[i]
+            dx, dy = rng.uniform(-step, step), rng.uniform(-step, step)
+            segments[i] = ((x1 + dx, y1 + dy), (x2 + dx, y2 + dy))
+        return segments
+
+    def check(self, kinetic, segments, msg):
+        expected = unique_points(brute_force(segments)[0])
+        found = kinetic.points()
+        self.assertEqual(len(found), len(expected), msg=msg)
+        for q in expected:
+            self.assertTrue(any(abs(p[0] - q[0]) < 1e-6 and abs(p[1] - q[1]) < 1e-6 for p in found),
+                            msg=f"{msg}: brak punktu {q}")
+
+    def test_frames_match_oracle(self):
+        for generator in GENERATORS:
+            for seed in range(4):
+                rng = random.Random(seed)
+                segments = generator(rng, 40)
+                kinetic = KineticIntersections(segments)
+                self.check(kinetic, segments, f"{generator.__name__} seed={seed} klatka=0")
+                for frame in range(1, 8):
+                    segments = self.move_some(rng, segments, 3)
+                    kinetic.update(segments)
+                    self.check(kinetic, segments, f"{generator.__name__} seed={seed} klatka={frame}")
+
+    def test_cost_follows_change(self):
+        """Przy kilku przesuniętych odcinkach sprawdzamy ułamek wszystkich par."""
+        rng = random.Random(3)
+        segments = short_segments(rng, 2000)
+        kinetic = KineticIntersections(segments)
+        segments = self.move_some(rng, segments, 5)
+        kinetic.update(segments)
+        self.assertLess(kinetic.last_checked, 200)
+        self.check(kinetic, segments, "short_segments")
+
+        kinetic.update(segments) # Brak ruchu - nic do sprawdzenia
+        self.assertEqual(kinetic.last_checked, 0)
+
+    def test_large_motion_rebuilds(self):
+        rng = random.Random(4)
+        segments = random_segments(rng, 30)
+        kinetic = KineticIntersections(segments, rebuild_fraction=0.5)
+        segments = self.move_some(rng, segments, 25, step=20)
+        kinetic.update(segments)
+        self.check(kinetic, segments, "pełna przebudowa")
+        kinetic.update(segments[:20]) # Zmiana liczby odcinków
+        self.check(kinetic, segments[:20], "zmiana liczby odcinków")
+
+    def test_long_segment_among_short(self):
+        """Długa przekątna nie zajmuje tysięcy kubełków, a jej przecięcia nie giną."""
+        rng = random.Random(5)
+        segments = short_segments(rng, 400)
+        segments.append(((0, 0), (400, 400)))
+        kinetic = KineticIntersections(segments)
+        self.assertLessEqual(max(len(cells) for cells in kinetic.segment_cells.values()), kinetic.max_cells)
+        self.check(kinetic, segments, "długi odcinek")
+
+        segments = self.move_some(rng, segments, 3)
+        segments[-1] = ((1, 0), (401, 399))
+        kinetic.update(segments)
+        self.check(kinetic, segments, "długi odcinek po ruchu")
+
+    def test_zero_length_first_frame(self):
+        """Pierwsza klatka z samych punktów nie daje kubełka 1e-9."""
+        rng = random.Random(6)
+        target = random_segments(rng, 20)
+        kinetic = KineticIntersections([(a, a) for a, b in target], rebuild_fraction=1.0)
+        frame = [(a, b) if i < 5 else (a, a) for i, (a, b) in enumerate(target)]
+        kinetic.update(frame)
+        self.check(kinetic, frame, "po klatce zerowej")
+        kinetic.update(target)
+        self.check(kinetic, target, "pełne odcinki")
+
+class TestSweepPerformance(unittest.TestCase):
+    """
+    Budżety czasowe. Limity są dużo luźniejsze niż typowe czasy, a test skalowania
+    porównuje czas dla n i 4n: przy O((n + k) log n) stosunek wynosi ok. 5,
+    przy regresji do O(n^2) - ok. 16.
+    """
+
+    def best_time(self, segments, repeats=3):
+        best = math.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run_sweep_line_algorithm(segments)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_time_budget(self):
+        segments = short_segments(random.Random(0), 4000)
+        self.assertLess(self.best_time(segments), 2.0)
+
+    def test_scaling(self):
+        small = self.best_time(short_segments(random.Random(1), 2000))
+        large = self.best_time(short_segments(random.Random(1), 8000))
+        self.assertLess(large / small, 10, msg=f"n=2000: {small:.3f}s, n=8000: {large:.3f}s")
+
+    def test_early_exit_ignores_k(self):
+        """has_intersection kończy przy pierwszym przecięciu - gęsta kratka nie spowalnia."""
+        n = 2000
+        grid = [((0, i + 0.5), (n, i + 0.7)) for i in range(n // 2)] + \
+               [((i + 0.5, -1), (i + 0.6, n)) for i in range(n // 2)]  # k = (n/2)^2
+        start = time.perf_counter()
+        self.assertTrue(has_intersection(grid))
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
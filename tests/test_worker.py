@@ -0,0 +1,70 @@
+import unittest
+import threading
+import sys
+import os
+from unittest import mock
+
+# --- KONFIGURACJA ŚCIEŻKI ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(parent_dir)
+
+from gui.worker import IntersectionWorker
+from logic.algorithm import find_intersection
+
+SEGMENTS = ((-2, -2), (2, 2), (-2, 2), (2, -2))
+
+class TestIntersectionWorker(unittest.TestCase):
+    """
+    Zlecenia nieaktualne. Pierwsze zlecenie jest wstrzymywane na bramce,
+    aby kolejne trafiły do kolejki, zanim wątek po nie sięgnie.
+    """
+
+    def run_gated(self, emit_point):
+        started, gate = threading.Event(), threading.Event()
+
+        def gated_find(*points, infinite=False, on_point=None):
+            if not started.is_set():
+                started.set()
+                gate.wait(2)
+                if not emit_point: return ("NONE", None) # Zamiatanie bez przecięć
+                on_point((0.0, 0.0))
+            return find_intersection(*points, infinite=infinite, on_point=on_point)
+
+        with mock.patch("gui.worker.find_intersection", gated_find):
+            worker = IntersectionWorker()
+            first = worker.submit(*SEGMENTS)
+            self.assertTrue(started.wait(2))
+            ids = [worker.submit(*SEGMENTS) for _ in range(3)]
+            gate.set()
+            return first, ids, self.collect(worker, ids[-1])
+
+    def collect(self, worker, last_id):
+        """Odbiera komunikaty aż do DONE ostatniego zlecenia."""
+        messages = []
+        while True:
+            msg = worker.results.get(timeout=2)
+            messages.append(msg)
+            if msg[0] == "DONE" and msg[1] == last_id: return messages
+
+    def test_only_newest_done_arrives(self):
+        """Wynik zlecenia zastąpionego w trakcie liczenia jest odrzucany, kolejka - opróżniana."""
+        first, ids, messages = self.run_gated(emit_point=False)
+        done = [msg for msg in messages if msg[0] == "DONE"]
+        self.assertEqual(done, [("DONE", ids[-1], ("POINT", (0.0, 0.0)))])
+        self.assertEqual({msg[1] for msg in messages}, {ids[-1]})
+
+    def test_stale_job_aborted_on_point(self):
+        """Zlecenie nieaktualne przerywa się przy pierwszym punkcie - bez PARTIAL i DONE."""
+        first, ids, messages = self.run_gated(emit_point=True)
+        self.assertNotIn(first, {msg[1] for msg in messages})
+        self.assertEqual(messages[-1], ("DONE", ids[-1], ("POINT", (0.0, 0.0))))
+
+    def test_partial_results_of_current_job(self):
+        worker = IntersectionWorker()
+        job = worker.submit(*SEGMENTS)
+        messages = self.collect(worker, job)
+        self.assertEqual(messages, [("PARTIAL", job, (0.0, 0.0)), ("DONE", job, ("POINT", (0.0, 0.0)))])
+
+if __name__ == '__main__':
+    unittest.main()